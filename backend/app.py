@@ -1,19 +1,43 @@
+import importlib
+
+import orjson
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse as _FastAPIORJSONResponse, StreamingResponse
 
 from backend.core import physics
-
-import backend.services.lht_service as lht_service
-import backend.services.ws100_service as ws100_service
-import backend.services.sensor_meta as sensor_meta
-import backend.services.pair_service as pair_service
-import backend.services.forecast_service as forecast_service
 from backend.routes import road_forecast
 
+# Service modules pull in pandas and the data pipelines, so they are imported
+# on first use instead of at startup (faster cold start / reload).
+_services = {}
+
+
+def _service(name: str):
+    """Import backend.services.<name> on first use and reuse it afterwards."""
+    module = _services.get(name)
+    if module is None:
+        module = _services[name] = importlib.import_module(f"backend.services.{name}")
+    return module
+
+
+class ORJSONResponse(_FastAPIORJSONResponse):
+    """
+    FastAPI's ORJSONResponse, always with OPT_SERIALIZE_NUMPY so NumPy arrays and
+    scalars are encoded as lists/numbers. Routes rely on orjson writing NaN (float
+    or NumPy) as null.
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
 app = FastAPI(
     title="Jyväskylä Weather Analysis API",
     version="0.1.0",
     description="Backend for LHT, WS100 and merged weather analysis.",
+    # orjson: much faster encoding of the large hourly/event payloads
+    default_response_class=ORJSONResponse,
 )
 
 # Allow CORS for local React development
@@ -55,7 +79,7 @@ def lht_demo_summary():
     """
     Run the LHT pipeline on synthetic data and return the summary stats.
     """
-    return lht_service.demo_summary()
+    return _service("lht_service").demo_summary()
 
 
 @app.get("/api/lht/sensor-summary")
@@ -78,7 +102,7 @@ def lht_sensor_summary(
       /api/lht/sensor-summary?sensor=Kaunisharjuntie&year=2023&month=7&day=15
     """
     try:
-        return lht_service.sensor_summary(sensor, year, month, day)
+        return _service("lht_service").sensor_summary(sensor, year, month, day)
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
@@ -91,7 +115,7 @@ def get_lht_sensors():
     Example response:
       {"sensors": ["Kaunisharjuntie", "Keltimaentie", ...]}
     """
-    return {"sensors": lht_service.list_sensors()}
+    return {"sensors": _service("lht_service").list_sensors()}
 
 
 @app.get("/api/lht/network-summary")
@@ -109,7 +133,7 @@ def get_lht_network_summary():
     Example:
       /api/lht/network-summary
     """
-    return lht_service.network_summary()
+    return _service("lht_service").network_summary()
 
 
 @app.get("/api/lht/sensor-timeseries")
@@ -126,7 +150,7 @@ def get_lht_sensor_timeseries(sensor: str, year: int = None, freq: str = 'M'):
       /api/lht/sensor-timeseries?sensor=Kaunisharjuntie&year=2023&freq=M
     """
     try:
-        return lht_service.sensor_timeseries(sensor, year, freq)
+        return _service("lht_service").sensor_timeseries(sensor, year, freq)
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except ValueError as e:
@@ -146,7 +170,7 @@ def get_lht_sensor_daily_detail(sensor: str, date: str):
       /api/lht/sensor-daily-detail?sensor=Kaunisharjuntie&date=2023-07-15
     """
     try:
-        return lht_service.sensor_daily_detail(sensor, date)
+        return _service("lht_service").sensor_daily_detail(sensor, date)
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -158,7 +182,7 @@ def ws100_demo_summary():
     """
     Run the WS100 pipeline on synthetic data and return the summary stats.
     """
-    return ws100_service.demo_summary()
+    return _service("ws100_service").demo_summary()
 
 
 
@@ -169,7 +193,7 @@ def forecast_summary():
 
     Used by the Overview KPI cards.
     """
-    return forecast_service.summary_10d()
+    return _service("forecast_service").summary_10d()
 
 
 @app.get("/api/ws100/sensor-summary")
@@ -181,7 +205,7 @@ def ws100_sensor_summary(sensor: str):
       /api/ws100/sensor-summary?sensor=Saaritie
     """
     try:
-        return ws100_service.sensor_summary(sensor)
+        return _service("ws100_service").sensor_summary(sensor)
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
@@ -194,7 +218,7 @@ def ws100_list_sensors():
     Returns:
       List of sensor names (without df_ prefix and .csv extension)
     """
-    return {"sensors": ws100_service.list_sensors()}
+    return {"sensors": _service("ws100_service").list_sensors()}
 
 
 @app.get("/api/ws100/data")
@@ -203,7 +227,9 @@ def ws100_sensor_data(sensor: str):
     Get hourly rain data for a specific WS100 sensor.
     """
     try:
-        return ws100_service.get_sensor_data(sensor)
+        # Returning the response object skips FastAPI's jsonable_encoder walk
+        # over every hourly record; the payload is already JSON-native
+        return ORJSONResponse(_service("ws100_service").get_sensor_data(sensor))
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
@@ -228,7 +254,8 @@ def ws100_dynamic_analysis(
         Dynamic analysis data with stacked_data, total_line, table_data, and events
     """
     try:
-        return ws100_service.analyze_dynamic(sensor, start_date, end_date, freq)
+        # Encoded by orjson directly (no jsonable_encoder pass), as in ws100_sensor_data
+        return ORJSONResponse(_service("ws100_service").analyze_dynamic(sensor, start_date, end_date, freq))
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -241,7 +268,7 @@ def list_sensors():
     """
     Return a list of all configured sensors (LHT and WS100).
     """
-    return sensor_meta.list_sensors()
+    return _service("sensor_meta").list_sensors()
 
 
 @app.get("/api/analyze/demo")
@@ -249,7 +276,7 @@ def analyze_demo():
     """
     Return a merged analysis of LHT and WS100 demo data.
     """
-    return pair_service.demo_analysis()
+    return _service("pair_service").demo_analysis()
 
 @app.get("/api/analyze/pair-hourly")
 def analyze_pair_hourly(
@@ -263,7 +290,32 @@ def analyze_pair_hourly(
     Returns merged hourly data for one LHT + WS100 pair with
     environment flags (is_raining, wet_or_rain, dry_enough_city, etc.).
     """
-    return pair_service.pair_hourly_preview(lht_sensor, ws100_sensor, max_hours)
+    return _service("pair_service").pair_hourly_preview(lht_sensor, ws100_sensor, max_hours)
+
+
+@app.get("/api/analyze/pair-hourly/stream")
+def analyze_pair_hourly_stream(
+    lht_sensor: str = "Kaunisharjuntie",
+    ws100_sensor: str = "Kotaniementie",
+    max_hours: int | None = None,
+):
+    """
+    Full merged hourly data for one LHT + WS100 pair as NDJSON
+    (application/x-ndjson): the first line is the header
+    {lht_sensor, ws100_sensor, n_hours, start, end}, then one JSON object
+    per hour with the same fields as the pair-hourly sample rows.
+
+    Rows are encoded chunk by chunk while the response is sent, so long
+    records don't have to be built as one payload in memory.
+    """
+    header, chunks = _service("pair_service").pair_hourly_stream(lht_sensor, ws100_sensor, max_hours)
+
+    def ndjson():
+        yield orjson.dumps(header) + b"\n"
+        for records in chunks:
+            yield b"".join(orjson.dumps(r) + b"\n" for r in records)
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
 
 
 @app.get("/api/analyze/pair-daily")
@@ -291,14 +343,14 @@ def analyze_pair_daily(
             "hourly": [ array of hourly records for the day ]
         }
     """
-    return pair_service.pair_daily_analysis(lht_sensor, ws100_sensor, date)
+    return _service("pair_service").pair_daily_analysis(lht_sensor, ws100_sensor, date)
 
 
 @app.get("/api/analyze/event-aggregates")
 def event_aggregates(
     date: str,
-    lht_sensor: str = pair_service.DEFAULT_LHT,
-    ws100_sensor: str = pair_service.DEFAULT_WS100,
+    lht_sensor: str = "Kaunisharjuntie",
+    ws100_sensor: str = "Kotaniementie",
     pre_h: int = 6,
     post_h: int = 12,):
     
@@ -306,7 +358,7 @@ def event_aggregates(
 
     Args mirror pair_event_aggregates in pair_service. No existing endpoints modified.
     """
-    return pair_service.pair_event_aggregates(
+    return _service("pair_service").pair_event_aggregates(
         date_str=date,
         lht_sensor=lht_sensor,
         ws100_sensor=ws100_sensor,
@@ -21,6 +21,15 @@ WIND_DATA_PATH = CLEANED_DATA_ROOT / "cleaned_wind_data.csv"
 # 10-day forecast CSV (hourly)
 FORECAST_DATA_PATH = CLEANED_DATA_ROOT / "forecast" / "jyvaskyla_10d_hourly.csv"
 
+# On-disk cache of per-sensor hourly aggregates (safe to delete, rebuilt on demand)
+HOURLY_CACHE_DIR = PROJECT_ROOT / ".cache" / "hourly"
+
+# On-disk cache of parsed raw sensor CSVs (safe to delete, rebuilt on demand)
+SENSOR_CACHE_DIR = PROJECT_ROOT / ".cache" / "sensors"
+
+# On-disk cache of Open-Meteo forecast fetches for the debug scripts (short-lived)
+OPENMETEO_CACHE_DIR = PROJECT_ROOT / ".cache" / "openmeteo"
+
 __all__ = [
 	"PROJECT_ROOT",
 	"CLEANED_DATA_ROOT",
@@ -28,4 +37,7 @@ __all__ = [
 	"WS100_DATA_DIR",
 	"WIND_DATA_PATH",
 	"FORECAST_DATA_PATH",
+	"HOURLY_CACHE_DIR",
+	"SENSOR_CACHE_DIR",
+	"OPENMETEO_CACHE_DIR",
 ]
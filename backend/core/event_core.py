@@ -1,9 +1,17 @@
 import pandas as pd
 import numpy as np
+from pandas.api.types import is_datetime64_any_dtype
 from .thresholds import DEFAULT_THRESHOLDS
 
 PRECIP_TYPES = {"Rain", "Mix", "Snow"}
 
+# Upper mm_total bounds for light/moderate/heavy; anything above is extreme
+INTENSITY_BINS = [5.0, 20.0, 40.0]
+INTENSITY_LABELS = np.array(["light", "moderate", "heavy", "extreme", "unknown"])
+
+NS_PER_HOUR = 3_600_000_000_000
+NS_PER_DAY = 24 * NS_PER_HOUR
+
 def classify_event_intensity(mm: float) -> str:
     if mm is None or np.isnan(mm):
         return "unknown"
@@ -15,6 +23,51 @@ def classify_event_intensity(mm: float) -> str:
         return "heavy"
     return "extreme"
 
+def ensure_datetime(ts: pd.Series) -> pd.Series:
+    """Parse timestamps only when the column is not already datetime64."""
+    return ts if is_datetime64_any_dtype(ts) else pd.to_datetime(ts)
+
+def _ns(ts: pd.Series) -> np.ndarray:
+    """Timestamps as int64 nanoseconds since the epoch (UTC for tz-aware columns)."""
+    return ensure_datetime(ts).values.astype("datetime64[ns]").view("i8")
+
+def _main_ptype(event_pos: np.ndarray, ptype: pd.Series, n_events: int) -> np.ndarray:
+    """Most frequent ptype per event (ties go to the type seen first in that event).
+
+    event_pos gives each row's event as 0..n_events-1. Counts and first positions
+    are accumulated into (event, ptype) matrices; events without any ptype get "Unknown".
+    """
+    if isinstance(ptype.dtype, pd.CategoricalDtype):
+        codes, cats = ptype.cat.codes.to_numpy(), ptype.cat.categories.to_numpy()
+    else:
+        codes, cats = pd.factorize(ptype)
+    if len(cats) == 0:
+        return np.full(n_events, "Unknown", dtype=object)
+    valid = codes >= 0
+    ev, codes = event_pos[valid], codes[valid]
+    row_pos = np.flatnonzero(valid)
+
+    counts = np.zeros((n_events, len(cats)), dtype=np.int64)
+    np.add.at(counts, (ev, codes), 1)
+    first_seen = np.full((n_events, len(cats)), np.iinfo(np.int64).max)
+    np.minimum.at(first_seen, (ev, codes), row_pos)
+
+    # Among the most frequent types of each event pick the earliest one
+    is_top = (counts == counts.max(axis=1, keepdims=True)) & (counts > 0)
+    best = np.where(is_top, first_seen, np.iinfo(np.int64).max).argmin(axis=1)
+    return np.where(is_top.any(axis=1), np.asarray(cats, dtype=object)[best], "Unknown")
+
+def _is_precip(ptype: pd.Series) -> np.ndarray:
+    """ptype in PRECIP_TYPES; categorical columns are matched on their integer codes."""
+    if isinstance(ptype.dtype, pd.CategoricalDtype):
+        codes = ptype.cat.codes.to_numpy()
+        cats = ptype.cat.categories
+        precip_codes = np.array([cats.get_loc(x) for x in PRECIP_TYPES if x in cats], dtype=codes.dtype)
+        return np.isin(codes, precip_codes)
+    # Labels are compared as they are: NaN / None / non-string values never
+    # equal a precipitation label, so the astype(str) copy is not needed
+    return ptype.isin(PRECIP_TYPES).to_numpy()
+
 def detect_events(
     pair_hourly: pd.DataFrame,
     rain_threshold: float = DEFAULT_THRESHOLDS.rain_event_mm_h,
@@ -26,79 +79,56 @@ def detect_events(
             "duration_h", "mm_total", "ptype_main", "event_intensity"
         ])
 
-    df = pair_hourly.copy()
-    df["timestamp"] = pd.to_datetime(df["timestamp"])  
-    rain = df.get("rain_mm_hour", 0).fillna(0).astype(float)
-    ptype = df.get("ptype_hour", "NoData").astype(str)
+    # Work on local Series; pair_hourly itself is never copied or modified
+    timestamp = ensure_datetime(pair_hourly["timestamp"])
+    rain = pair_hourly.get("rain_mm_hour", 0).fillna(0).astype(float)
+    ptype = pair_hourly.get("ptype_hour", "NoData")
 
-    mask = (rain >= rain_threshold) | (ptype.isin(PRECIP_TYPES))
-    rainy = df.loc[mask, ["timestamp"]].sort_values("timestamp")
+    mask = (rain.to_numpy() >= rain_threshold) | _is_precip(ptype)
+    rainy = timestamp[mask].sort_values()
     if rainy.empty:
         return pd.DataFrame(columns=[
             "event_id", "start_ts", "end_ts", "start_date",
             "duration_h", "mm_total", "ptype_main", "event_intensity"
         ])
 
-    events = []
-    current_start = None
-    last_ts = None
-    event_id = 0
-    for ts in rainy["timestamp"]:
-        if current_start is None:
-            # start first event
-            event_id += 1
-            current_start = ts
-            last_ts = ts
-            continue
-        gap_h = (ts - last_ts) / pd.Timedelta(hours=1)
-        if gap_h <= max_gap_hours:
-            # continue same event
-            last_ts = ts
-        else:
-            # close previous and start new
-            events.append({
-                "event_id": event_id,
-                "start_ts": current_start,
-                "end_ts": last_ts,
-                "start_date": current_start.strftime("%Y-%m-%d"),
-            })
-            event_id += 1
-            current_start = ts
-            last_ts = ts
-    # append final event
-    if current_start is not None:
-        events.append({
-            "event_id": event_id,
-            "start_ts": current_start,
-            "end_ts": last_ts,
-            "start_date": current_start.strftime("%Y-%m-%d"),
-        })
-
-    # Enrich events with stats (mm_total, duration, intensity)
-    enriched = []
-    for ev in events:
-        # Slice original df to get all hours in [start_ts, end_ts]
-        # This includes the gaps if they were bridged
-        sub = df[(df["timestamp"] >= ev["start_ts"]) & (df["timestamp"] <= ev["end_ts"])]
-        
-        mm_total = sub["rain_mm_hour"].sum() if "rain_mm_hour" in sub.columns else 0.0
-        # Duration in hours. Since it's hourly data, count of rows is hours (inclusive)
-        duration_h = len(sub)
-        
-        # ptype_main: most frequent ptype
-        ptype_main = "Unknown"
-        if "ptype_hour" in sub.columns:
-            counts = sub["ptype_hour"].value_counts()
-            if not counts.empty:
-                ptype_main = counts.index[0]
-
-        ev["duration_h"] = float(duration_h)
-        ev["mm_total"] = float(mm_total)
-        ev["ptype_main"] = str(ptype_main)
-        ev["event_intensity"] = classify_event_intensity(float(mm_total))
-        enriched.append(ev)
-
-    return pd.DataFrame(enriched)
+    # A new event starts whenever the gap to the previous rainy hour exceeds max_gap_hours
+    gaps = rainy.diff()
+    new_event = (gaps.isna() | (gaps > pd.Timedelta(hours=max_gap_hours))).to_numpy()
+    last_of_event = np.append(new_event[1:], True)
+    starts = rainy[new_event].reset_index(drop=True)
+    ends = rainy[last_of_event].reset_index(drop=True)
+    n_events = len(starts)
+
+    # Tag every hour inside an event span (bridged gap hours included) with its event position
+    ts = timestamp.values
+    idx = np.searchsorted(starts.values, ts, side="right") - 1
+    in_event = (idx >= 0) & (ts <= ends.values[np.maximum(idx, 0)])
+    event_pos = idx[in_event]
+
+    # Enrich events with stats (mm_total, duration, intensity) as columnar arrays
+    # Duration in hours. Since it's hourly data, count of rows is hours (inclusive)
+    duration_h = np.bincount(event_pos, minlength=n_events).astype(float)
+    if "rain_mm_hour" in pair_hourly.columns:
+        mm_total = np.bincount(event_pos, weights=rain.to_numpy()[in_event], minlength=n_events)
+    else:
+        mm_total = np.zeros(n_events)
+    if "ptype_hour" in pair_hourly.columns:
+        ptype_main = _main_ptype(event_pos, pair_hourly["ptype_hour"][in_event], n_events).astype(str)
+    else:
+        ptype_main = np.full(n_events, "Unknown")
+    bins = np.where(np.isnan(mm_total), len(INTENSITY_BINS) + 1, np.digitize(mm_total, INTENSITY_BINS))
+
+    return pd.DataFrame({
+        "event_id": np.arange(1, n_events + 1, dtype=np.int64),
+        "start_ts": starts,
+        "end_ts": ends,
+        "start_date": starts.dt.strftime("%Y-%m-%d"),
+        "duration_h": duration_h,
+        "mm_total": mm_total,
+        "ptype_main": ptype_main,
+        "event_intensity": INTENSITY_LABELS[bins],
+    })
 
 
 def build_event_windows(
@@ -127,79 +157,72 @@ def build_event_windows(
             "surface_pressure_hpa", "wet_or_rain", "dry_enough_city"
         ])
 
-    base = pair_hourly.copy()
-    base["timestamp"] = pd.to_datetime(base["timestamp"])
-    rows = []
-    
-    for _, ev in events_df.iterrows():
-        start_ts = pd.to_datetime(ev["start_ts"]) if not isinstance(ev["start_ts"], pd.Timestamp) else ev["start_ts"]
-        window_start = start_ts - pd.Timedelta(hours=pre_h)
-        window_end = start_ts + pd.Timedelta(hours=post_h)
-        
-        # Create COMPLETE hourly time range for this window
-        complete_range = pd.date_range(
-            start=window_start,
-            end=window_end,
-            freq='h'
-        )
-        
-        # Build a dataframe with all hours
-        complete_df = pd.DataFrame({'timestamp': complete_range})
-        complete_df['event_id'] = int(ev["event_id"])
-        complete_df['start_ts'] = start_ts
-        complete_df['end_ts'] = pd.to_datetime(ev["end_ts"])
-        complete_df['rel_hour'] = (complete_df["timestamp"] - start_ts) / pd.Timedelta(hours=1)
-        
-        # Get actual data for this window
-        subset = base[(base["timestamp"] >= window_start) & (base["timestamp"] <= window_end)].copy()
-        
-        # Merge complete time range with available data (left join to keep all hours)
-        merged = pd.merge(
-            complete_df,
-            subset,
-            on='timestamp',
-            how='left'
-        )
-        
-        # Keep necessary columns
-        keep_cols = [
-            "event_id", "timestamp", "rel_hour", "rh_pct", "dp_spread_C",
-            "vpd_kpa", "wind_speed_kmh", "wind_direction_deg", "wind_gusts_kmh", 
-            "surface_pressure_hpa", "wet_or_rain", "dry_enough_city",
-            "start_ts", "end_ts"
-        ]
-        
-        # Ensure all columns exist
-        for col in keep_cols:
-            if col not in merged.columns:
-                merged[col] = np.nan if col not in ["event_id", "timestamp", "rel_hour", "start_ts", "end_ts"] else None
-        
-        rows.append(merged[keep_cols])
-    
-    if not rows:
-        return pd.DataFrame(columns=[
-            "event_id", "timestamp", "rel_hour", "rh_pct", "dp_spread_C",
-            "vpd_kpa", "wind_speed_kmh", "wind_direction_deg", "wind_gusts_kmh",
-            "surface_pressure_hpa", "wet_or_rain", "dry_enough_city",
-            "start_ts", "end_ts"
-        ])
-    
-    out = pd.concat(rows, ignore_index=True).sort_values(["event_id", "timestamp"])
-    return out
+    value_cols = [
+        "rh_pct", "dp_spread_C", "vpd_kpa", "wind_speed_kmh", "wind_direction_deg",
+        "wind_gusts_kmh", "surface_pressure_hpa", "wet_or_rain", "dry_enough_city",
+    ]
+    base = pair_hourly[[c for c in value_cols if c in pair_hourly.columns]].set_axis(
+        ensure_datetime(pair_hourly["timestamp"]), axis=0
+    ).sort_index()
+    # pair_hourly is one row per hour; reindex needs a unique index
+    base = base[~base.index.duplicated()]
+
+    # COMPLETE hourly timestamps for every window at once:
+    # one row per (event, hour offset), so gaps in the source data stay as NaN rows
+    width = pre_h + post_h + 1
+    n_events = len(events_df)
+    rel = np.tile(np.arange(-pre_h, post_h + 1), n_events)
+    starts = ensure_datetime(events_df["start_ts"]).repeat(width).reset_index(drop=True)
+    window_ts = starts + pd.to_timedelta(rel, unit="h")
+
+    # Sorted-index lookup of all windows at once; missing hours come back as NaN
+    event_ids = events_df["event_id"].astype(int).to_numpy()
+    out = base.reindex(window_ts).reset_index(drop=True).assign(
+        event_id=np.repeat(event_ids, width),
+        timestamp=window_ts,
+        rel_hour=rel.astype(float),
+        start_ts=starts,
+        end_ts=ensure_datetime(events_df["end_ts"]).repeat(width).reset_index(drop=True),
+    )
+
+    # Ensure all columns exist
+    for col in value_cols:
+        if col not in out.columns:
+            out[col] = np.nan
+
+    keep_cols = [
+        "event_id", "timestamp", "rel_hour", *value_cols, "start_ts", "end_ts"
+    ]
+    out = out[keep_cols]
+    # Each window's hours are increasing already, so rows are in (event_id, timestamp)
+    # order whenever the event ids are (detect_events numbers them 1..n)
+    if (np.diff(event_ids) > 0).all():
+        return out
+    return out.sort_values(["event_id", "timestamp"])
 
 
-def aggregate_environment(windows: pd.DataFrame) -> pd.DataFrame:
-    """Aggregate environment metrics by rel_hour across all events.
+def _mean_by_rel_hour(windows: pd.DataFrame, cols: list[str]) -> pd.DataFrame:
+    """NaN-skipping mean of cols per rel_hour, sorted by rel_hour.
 
-    Computes mean of rh_pct, dp_spread_C, vpd_kpa, wind_speed_kmh.
-    Returns DataFrame with columns: rel_hour, rh_mean, dp_spread_mean, vpd_mean, wind_mean
+    rel_hour takes only a few hundred distinct values, so the groups are
+    labelled with np.unique and reduced with np.bincount instead of a hashed groupby.
     """
-    if windows.empty:
-        return pd.DataFrame(columns=[
-            "rel_hour", "rh_mean", "dp_spread_mean", "vpd_mean", "wind_mean",
-            "wind_direction_deg_mean", "wind_gusts_kmh_mean", "surface_pressure_hpa_mean"
-        ])
-
+    rel = windows["rel_hour"].to_numpy(dtype=float)
+    keep = ~np.isnan(rel)
+    hours, codes = np.unique(rel[keep], return_inverse=True)
+    out = {"rel_hour": hours}
+    for col in cols:
+        vals = windows[col].to_numpy(dtype=float)[keep]
+        valid = ~np.isnan(vals)
+        sums = np.bincount(codes[valid], weights=vals[valid], minlength=len(hours))
+        counts = np.bincount(codes[valid], minlength=len(hours))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out[col] = np.where(counts > 0, sums / counts, np.nan)
+    return pd.DataFrame(out)
+
+
+def _environment_mean_cols(windows: pd.DataFrame) -> list[str]:
+    """Window columns averaged by aggregate_environment (optional wind fields only if present)."""
     agg_spec = {
         "rh_pct": "mean",
         "dp_spread_C": "mean",
@@ -215,8 +238,27 @@ def aggregate_environment(windows: pd.DataFrame) -> pd.DataFrame:
     for out_name, src_name in optional_cols:
         if src_name in windows.columns:
             agg_spec[src_name] = "mean"
+    return list(agg_spec)
 
-    grp = windows.groupby("rel_hour", as_index=False).agg(agg_spec)
+
+def aggregate_environment(windows: pd.DataFrame, means: pd.DataFrame | None = None) -> pd.DataFrame:
+    """Aggregate environment metrics by rel_hour across all events.
+
+    Computes mean of rh_pct, dp_spread_C, vpd_kpa, wind_speed_kmh.
+    Returns DataFrame with columns: rel_hour, rh_mean, dp_spread_mean, vpd_mean, wind_mean
+    means: optional _mean_by_rel_hour(windows, ...) result that already has these columns.
+    """
+    if windows.empty:
+        return pd.DataFrame(columns=[
+            "rel_hour", "rh_mean", "dp_spread_mean", "vpd_mean", "wind_mean",
+            "wind_direction_deg_mean", "wind_gusts_kmh_mean", "surface_pressure_hpa_mean"
+        ])
+
+    cols = _environment_mean_cols(windows)
+    if means is None:
+        grp = _mean_by_rel_hour(windows, cols)
+    else:
+        grp = means[["rel_hour", *cols]]
     rename_map = {
         "rh_pct": "rh_mean",
         "dp_spread_C": "dp_spread_mean",
@@ -242,39 +284,46 @@ def compute_event_drying_times(windows: pd.DataFrame) -> pd.DataFrame:
     if windows.empty:
         return pd.DataFrame(columns=["event_id", "drying_hours_from_start", "drying_hours_from_end", "drying_hours"])
 
-    results = []
-    # Group by event_id
-    for event_id, sub in windows.groupby("event_id"):
-        # We look for dry_enough_city == True in the post-start window
-        post_start = sub[sub["rel_hour"] >= 0]
-        dry_rows = post_start[post_start["dry_enough_city"] == True]
-
-        if not dry_rows.empty:
-            first_dry_ts = dry_rows["timestamp"].min()
-            # Ensure start_ts and end_ts are timestamps
-            start_ts = pd.to_datetime(sub["start_ts"].iloc[0])
-            end_ts = pd.to_datetime(sub["end_ts"].iloc[0])
-
-            drying_start = (first_dry_ts - start_ts).total_seconds() / 3600.0
-            drying_end = (first_dry_ts - end_ts).total_seconds() / 3600.0
-
-            results.append({
-                "event_id": event_id,
-                "drying_hours_from_start": drying_start,
-                "drying_hours_from_end": drying_end,
-                "drying_hours": drying_end  
-            })
-
-    return pd.DataFrame(results)
-
-
-def aggregate_fractions(windows: pd.DataFrame) -> tuple[pd.DataFrame, dict]:
+    eid = windows["event_id"].to_numpy()
+    ts_ns = _ns(windows["timestamp"])
+    # build_event_windows already orders rows by (event_id, timestamp); only sort other input
+    d_eid, d_ts = np.diff(eid), np.diff(ts_ns)
+    if not np.all((d_eid > 0) | ((d_eid == 0) & (d_ts >= 0))):
+        order = np.lexsort((ts_ns, eid))
+        windows, eid, ts_ns = windows.iloc[order], eid[order], ts_ns[order]
+
+    # We look for dry_enough_city == True in the post-start window
+    hit = np.flatnonzero((windows["dry_enough_city"] == True).to_numpy() & (windows["rel_hour"].to_numpy() >= 0))
+    # First dry hour per event: the first hit after each event_id boundary
+    first_pos = hit[np.r_[True, eid[hit][1:] != eid[hit][:-1]]] if len(hit) else hit
+    first = windows.iloc[first_pos]
+
+    # Differences in int64 nanoseconds -> hours
+    first_dry_ns = ts_ns[first_pos]
+    drying_start = (first_dry_ns - _ns(first["start_ts"])) / NS_PER_HOUR
+    drying_end = (first_dry_ns - _ns(first["end_ts"])) / NS_PER_HOUR
+
+    return pd.DataFrame({
+        "event_id": first["event_id"].to_numpy(),
+        "drying_hours_from_start": drying_start,
+        "drying_hours_from_end": drying_end,
+        "drying_hours": drying_end,
+    })
+
+
+def aggregate_fractions(
+    windows: pd.DataFrame,
+    drying_df: pd.DataFrame | None = None,
+    means: pd.DataFrame | None = None,
+) -> tuple[pd.DataFrame, dict]:
     """Aggregate wet/dry fractions by rel_hour and compute median drying time.
 
     wet_frac = mean(wet_or_rain)
     dry_frac = mean(dry_enough_city)
 
-    Drying time per event: computed via compute_event_drying_times.
+    Drying time per event: computed via compute_event_drying_times, unless the
+    caller already has that frame for the same windows and passes it as drying_df.
+    means: optional _mean_by_rel_hour(windows, ...) result with the two flag columns.
     Returns (frac_df, stats_dict).
     stats_dict contains:
       - median_drying_h (from end)
@@ -284,12 +333,15 @@ def aggregate_fractions(windows: pd.DataFrame) -> tuple[pd.DataFrame, dict]:
     if windows.empty:
         return pd.DataFrame(columns=["rel_hour", "wet_frac", "dry_frac"]), {}
 
-    frac = windows.groupby("rel_hour", as_index=False).agg({
-        "wet_or_rain": "mean",
-        "dry_enough_city": "mean",}).rename(columns={"wet_or_rain": "wet_frac", "dry_enough_city": "dry_frac"}).sort_values("rel_hour")
+    if means is None:
+        means = _mean_by_rel_hour(windows, ["wet_or_rain", "dry_enough_city"])
+    frac = means[["rel_hour", "wet_or_rain", "dry_enough_city"]].rename(
+        columns={"wet_or_rain": "wet_frac", "dry_enough_city": "dry_frac"})
+    # Hours where every event is missing data count as 0 (not wet / not dry)
     frac[["wet_frac", "dry_frac"]] = frac[["wet_frac", "dry_frac"]].fillna(0.0)
     # Drying time per event
-    drying_df = compute_event_drying_times(windows)
+    if drying_df is None:
+        drying_df = compute_event_drying_times(windows)
     
     stats = {}
     if not drying_df.empty:
@@ -300,31 +352,61 @@ def aggregate_fractions(windows: pd.DataFrame) -> tuple[pd.DataFrame, dict]:
     return frac, stats
 
 
+def aggregate_event_windows(
+    windows: pd.DataFrame,
+) -> tuple[pd.DataFrame, pd.DataFrame, dict, pd.DataFrame]:
+    """All window aggregates in one go.
+
+    Same results as aggregate_environment(windows), aggregate_fractions(windows)
+    and compute_event_drying_times(windows), but the rel_hour labelling is done
+    once for every environment and flag column, and drying times are computed once.
+    Returns (env_df, frac_df, drying_stats, drying_df).
+    """
+    drying_df = compute_event_drying_times(windows)
+    means = None
+    if not windows.empty:
+        cols = [*_environment_mean_cols(windows), "wet_or_rain", "dry_enough_city"]
+        means = _mean_by_rel_hour(windows, cols)
+    env_df = aggregate_environment(windows, means=means)
+    frac_df, drying_stats = aggregate_fractions(windows, drying_df=drying_df, means=means)
+    return env_df, frac_df, drying_stats, drying_df
+
+
 def build_rh_heatmap(pair_hourly: pd.DataFrame, events_df: pd.DataFrame) -> dict:
     """Create humidity (%) heatmap for dates that have at least one event.
 
     For each start_date present in events_df, compute mean rh_pct per hour (0..23).
-    Returns dict with keys: dates (list), hours (0..23 list), rh_matrix (2D list).
+    Returns dict with keys: dates (list), hours (0..23 list),
+    rh_matrix (2D float ndarray, dates x hours; NaN where there is no data).
     """
     if pair_hourly.empty or events_df.empty:
-        return {"dates": [], "hours": list(range(24)), "rh_matrix": []}
+        return {"dates": [], "hours": list(range(24)), "rh_matrix": np.empty((0, 24))}
 
     event_dates = events_df["start_date"].unique().tolist()
-    df = pair_hourly.copy()
-    df["timestamp"] = pd.to_datetime(df["timestamp"])
-    df["date_str"] = df["timestamp"].dt.strftime("%Y-%m-%d")
-    df["hour"] = df["timestamp"].dt.hour
-    df = df[df["date_str"].isin(event_dates)]
+    ts = ensure_datetime(pair_hourly["timestamp"])
+    if ts.dt.tz is not None:
+        # keep local wall-clock dates
+        ts = ts.dt.tz_localize(None)
+    # Integer day / hour bins straight from the int64 nanoseconds (no strftime, no .dt)
+    ns = ts.values.astype("datetime64[ns]").view("i8")
+    day = ns // NS_PER_DAY
+    hour = (ns - day * NS_PER_DAY) // NS_PER_HOUR
+    event_days = np.array(event_dates, dtype="datetime64[D]").view("i8")
+
+    # Row of each hour's date in the matrix (-1 when the date has no event)
+    order = np.argsort(event_days)
+    pos = np.clip(np.searchsorted(event_days, day, sorter=order), 0, len(event_days) - 1)
+    row = np.where(event_days[order[pos]] == day, order[pos], -1)
+
+    rh = pair_hourly["rh_pct"].to_numpy(dtype=float)
+    keep = (row >= 0) & ~np.isnan(rh)
     hours = list(range(24))
-    rh_matrix = []
-    for d in event_dates:
-        sub = df[df["date_str"] == d]
-        row_vals = []
-        for h in hours:
-            h_sub = sub[sub["hour"] == h]
-            if h_sub.empty:
-                row_vals.append(None)
-            else:
-                row_vals.append(float(h_sub["rh_pct"].mean()))
-        rh_matrix.append(row_vals)
+
+    # Mean per (date, hour) cell with one weighted bincount over row * 24 + hour
+    n_cells = len(event_days) * 24
+    cell = row[keep] * 24 + hour[keep]
+    sums = np.bincount(cell, weights=rh[keep], minlength=n_cells)
+    counts = np.bincount(cell, minlength=n_cells)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rh_matrix = np.where(counts > 0, sums / counts, np.nan).reshape(len(event_days), 24)
     return {"dates": event_dates, "hours": hours, "rh_matrix": rh_matrix}
@@ -3,6 +3,33 @@ import numpy as np
 from backend.core.physics import dewpoint_C, vpd_kpa, abs_humidity_gm3
 
 
+def _fill_short_gaps(t: np.ndarray, x: np.ndarray, limit: int) -> np.ndarray:
+    """
+    Linear-in-time fill of interior NaN runs, up to `limit` samples away from a
+    valid value on either side. Same result as
+    interpolate(method="time", limit=limit, limit_direction="both", limit_area="inside").
+    """
+    good = ~np.isnan(x)
+    if good.all() or good.sum() < 2:
+        return x
+
+    n = len(x)
+    pos = np.arange(n)
+    # Position of the previous / next valid sample for every row
+    prev_good = np.maximum.accumulate(np.where(good, pos, -1))
+    next_good = np.minimum.accumulate(np.where(good, pos, n)[::-1])[::-1]
+
+    fill = (
+        ~good
+        & (prev_good >= 0)
+        & (next_good < n)
+        & ((pos - prev_good <= limit) | (next_good - pos <= limit))
+    )
+    out = x.copy()
+    out[fill] = np.interp(t[fill], t[good], x[good])
+    return out
+
+
 def clean_lht_sensor(
     raw_data: pd.DataFrame,
     timestamp_col: str = "Timestamp",
@@ -12,10 +39,12 @@ def clean_lht_sensor(
     temp_range=(-40.0, 38.0),
     hum_range=(0.0, 100.0),):
    
-    df = raw_data.copy()
-
-    # Parse and sort timestamps
-    df[timestamp_col] = pd.to_datetime(df[timestamp_col])
+    # Parse and sort timestamps (assign returns a new frame, raw_data is untouched).
+    # Columns parsed by read_csv are already datetime64 and are used as-is.
+    ts = raw_data[timestamp_col]
+    if not pd.api.types.is_datetime64_any_dtype(ts):
+        ts = pd.to_datetime(ts)
+    df = raw_data.assign(**{timestamp_col: ts})
     df = df.sort_values(timestamp_col)
 
     # Keep only data after the start date (outdoor period)
@@ -41,12 +70,9 @@ def clean_lht_sensor(
     df.loc[~correct_humidity, "Humidity"] = pd.NA
 
     # Interpolate short gaps in time
-    df = df.interpolate(
-        method="time",
-        limit=3,
-        limit_direction="both",
-        limit_area="inside",
-    )
+    t = df.index.asi8.astype(float)
+    for col in df.select_dtypes("float").columns:
+        df[col] = _fill_short_gaps(t, df[col].to_numpy(dtype=float), limit=3)
 
     # Back to a clean, time-sorted dataframe with Timestamp column
     df = df.reset_index().rename(columns={timestamp_col: "Timestamp"})
@@ -63,46 +89,75 @@ def prepare_and_features(df: pd.DataFrame) -> pd.DataFrame:
     - VPD
     - hour and date columns
     """
-    report_df = df.copy()
-    report_df = report_df.dropna(subset=["Timestamp"]).sort_values("Timestamp")
-
-    report_df["Temperature_C"] = pd.to_numeric(
-        report_df["Temperature_C"], errors="coerce"
+    report_df = df.dropna(subset=["Timestamp"]).sort_values("Timestamp")
+
+    temp = pd.to_numeric(report_df["Temperature_C"], errors="coerce")
+    rh = pd.to_numeric(report_df["Humidity"], errors="coerce")
+    ts = report_df["Timestamp"]
+
+    # All new / coerced columns in a single assign
+    report_df = report_df.assign(
+        Temperature_C=temp,
+        Humidity=rh,
+        # Derived variables
+        DewPoint_C=dewpoint_C(temp, rh),
+        # Humidity was range-filtered to 0-100 by clean_lht_sensor
+        AbsHum_gm3=abs_humidity_gm3(temp, rh, rh_validated=True),
+        VPD_kPa=vpd_kpa(temp, rh),
+        hour=ts.dt.hour,
+        date=ts.dt.date,
     )
-    report_df["Humidity"] = pd.to_numeric(report_df["Humidity"], errors="coerce")
 
-    # Derived variables
-    report_df["DewPoint_C"] = dewpoint_C(
-        report_df["Temperature_C"], report_df["Humidity"]
-    )
-    report_df["AbsHum_gm3"] = abs_humidity_gm3(
-        report_df["Temperature_C"], report_df["Humidity"]
-    )
-    report_df["VPD_kPa"] = vpd_kpa(
-        report_df["Temperature_C"], report_df["Humidity"]
-    )
+    return report_df
 
-    report_df["hour"] = report_df["Timestamp"].dt.hour
-    report_df["date"] = report_df["Timestamp"].dt.date
 
-    return report_df
+def _daily_top_k_mean(day_id: np.ndarray, values: np.ndarray, k: int = 4) -> np.ndarray:
+    """
+    Mean of the k largest non-NaN values of each day, without sorting the values.
+    day_id must be sorted so that each day is one contiguous block.
+    Days without any valid value give NaN.
+    """
+    n = len(values)
+    starts = np.flatnonzero(np.r_[True, day_id[1:] != day_id[:-1]])
+    group = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, n]))
+    pos = np.arange(n)
+
+    v = np.where(np.isnan(values), -np.inf, values)
+    total = np.zeros(len(starts))
+    count = np.zeros(len(starts))
+    # k passes of a per-day max; after each pass the first occurrence of the max is knocked out
+    for _ in range(k):
+        day_max = np.maximum.reduceat(v, starts)
+        valid = day_max > -np.inf
+        total[valid] += day_max[valid]
+        count[valid] += 1
+        first_max = np.minimum.reduceat(np.where(v == day_max[group], pos, n), starts)
+        v[first_max[valid]] = -np.inf
+
+    with np.errstate(invalid="ignore"):
+        return total / count
 
 
 def summarize(report_df: pd.DataFrame) -> dict:
-    df = report_df.copy()
+    df = report_df
 
     # typical time step in minutes
     step_min = df["Timestamp"].diff().dt.total_seconds().median() / 60.0
 
-    # Daily temperature range (median T_max - T_min)
+    # All daily statistics in one groupby. Days are keyed by the normalized
+    # datetime64 timestamp (same days as the "date" column, but no Python date objects to hash).
+    day = df["Timestamp"].dt.normalize()
     daily = (
-        df.groupby("date")
+        df.groupby(day)
         .agg(
             T_min=("Temperature_C", "min"),
             T_max=("Temperature_C", "max"),
             RH_mean=("Humidity", "mean"),
+            VPD_max=("VPD_kPa", "max"),
         )
     )
+
+    # Daily temperature range (median T_max - T_min)
     if not daily.empty:
         daily_temp_range = (daily["T_max"] - daily["T_min"]).median()
     else:
@@ -124,15 +179,17 @@ def summarize(report_df: pd.DataFrame) -> dict:
         Humidity_24H = float("nan")
 
     # VPD peaks: mean of daily maxima
-    daily_vpd_max = df.groupby("date")["VPD_kPa"].max()
-    vpd_peak_mean = daily_vpd_max.mean() if not daily_vpd_max.empty else float("nan")
+    vpd_peak_mean = daily["VPD_max"].mean() if not daily.empty else float("nan")
 
     # VPD smoothed peaks: mean of top-4 VPD values per day, averaged over days
-    data_sorted = df.sort_values(["date", "VPD_kPa"], ascending=[True, False])
-    top4 = data_sorted.groupby("date").head(4)
-    daily_vpd_top4 = top4.groupby("date")["VPD_kPa"].mean()
+    day_id = day.values.view(np.int64)
+    vpd = df["VPD_kPa"].to_numpy(dtype=float)
+    if len(day_id) and not (day_id[1:] >= day_id[:-1]).all():
+        order = np.argsort(day_id, kind="stable")
+        day_id, vpd = day_id[order], vpd[order]
+    daily_vpd_top4 = _daily_top_k_mean(day_id, vpd, k=4) if len(vpd) else np.empty(0)
     vpd_peak_smooth = (
-        daily_vpd_top4.mean() if not daily_vpd_top4.empty else float("nan")
+        np.nanmean(daily_vpd_top4) if np.isfinite(daily_vpd_top4).any() else float("nan")
     )
 
     # Comfort / condensation percentages
@@ -161,11 +218,12 @@ def summarize(report_df: pd.DataFrame) -> dict:
 
 
 def aggregate_lht_hourly(df: pd.DataFrame) -> pd.DataFrame:
-    hourly = df.copy()
-    hourly["Timestamp"] = pd.to_datetime(hourly["Timestamp"])
-    hourly = hourly.set_index("Timestamp")
-    
+    ts = df["Timestamp"]
+    if not pd.api.types.is_datetime64_any_dtype(ts):
+        ts = pd.to_datetime(ts)
+    hourly = df[["Temperature_C", "Humidity"]].set_index(ts)
+
     # Hourly means
-    hourly_agg = hourly[["Temperature_C", "Humidity"]].resample("h").mean()
+    hourly_agg = hourly.resample("h").mean()
     
     return hourly_agg.reset_index()
@@ -13,8 +13,7 @@ def load_wind_hourly(csv_path: str) -> pd.DataFrame:
     
     Returns hourly DataFrame with standardized column names.
     """
-    df = pd.read_csv(csv_path)
-    df["Timestamp"] = pd.to_datetime(df["Timestamp"])
+    df = pd.read_csv(csv_path, parse_dates=["Timestamp"])
     df = df.sort_values("Timestamp")
     
     # Rename to standardized names
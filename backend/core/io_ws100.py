@@ -17,14 +17,74 @@ def bucket_precip_type(code):
     return "Other"
 
 
+# All values bucket_precip_type can return; ptype_hour columns use these as categories
+PTYPE_CATEGORIES = ["Dry", "Rain", "Mix", "Snow", "Other", "NoData"]
+
+# Lookup table code -> bucket for codes 0..255, same rules as bucket_precip_type,
+# plus one slot for out-of-range codes and one for missing codes
+_PTYPE_OTHER = 256
+_PTYPE_NODATA = 257
+_PTYPE_BUCKETS = np.full(258, "Other", dtype=object)
+_PTYPE_BUCKETS[0] = "Dry"
+_PTYPE_BUCKETS[60] = "Rain"
+_PTYPE_BUCKETS[61:70] = "Mix"
+_PTYPE_BUCKETS[70] = "Snow"
+_PTYPE_BUCKETS[_PTYPE_NODATA] = "NoData"
+
+
+def bucket_precip_types(codes) -> np.ndarray:
+    """Vectorised bucket_precip_type over an array/Series of precipitationType codes."""
+    # All the work is on integer table positions; the object array of labels
+    # is built by a single take() at the end
+    raw = np.asarray(codes)
+    if raw.dtype.kind in "iu":
+        # Integer codes (what read_csv gives without gaps) cannot be missing
+        idx = np.where((raw >= 0) & (raw < _PTYPE_OTHER), raw, _PTYPE_OTHER)
+    else:
+        c = np.trunc(np.asarray(codes, dtype=float))
+        idx = np.where((c >= 0) & (c < _PTYPE_OTHER), c, _PTYPE_OTHER)
+        idx[np.isnan(c)] = _PTYPE_NODATA
+    return _PTYPE_BUCKETS.take(idx.astype(np.intp))
+
+
+def hourly_mode(codes: pd.Series) -> pd.Series:
+    """Most frequent code per hour (ties -> smallest code, like Series.mode()[0])."""
+    valid = codes.dropna()
+    counts = (
+        pd.DataFrame({"hour": valid.index.floor("h"), "code": valid.to_numpy()})
+        .value_counts(["hour", "code"])
+        .rename("n")
+        .reset_index()
+    )
+    counts = counts.sort_values(["hour", "n", "code"], ascending=[True, False, True])
+    return counts.drop_duplicates("hour").set_index("hour")["code"]
+
+
+# Raw WS100 CSV columns the backend uses (rain comes from whichever column exists);
+# the intensity and absolute-quantity columns are never read
+WS100_CSV_COLUMNS = {"Timestamp", "precipitationQuantityDiff_mm", "Rain_mm_10min", "precipitationType"}
+
+
+def read_ws100_csv(csv_path) -> pd.DataFrame:
+    """WS100_CSV_COLUMNS of one sensor CSV, with Timestamp parsed by the C reader (ISO 8601)."""
+    return pd.read_csv(
+        csv_path,
+        usecols=lambda c: c in WS100_CSV_COLUMNS,
+        parse_dates=["Timestamp"],
+        date_format="ISO8601",
+    )
+
+
 def clean_ws100_sensor(
     raw_data: pd.DataFrame,
     timestamp_col: str = "Timestamp",
     rain_col: str = "Rain_mm_10min",
     start_date: str | None = None,) -> pd.DataFrame:
-    df = raw_data.copy()
-
-    df[timestamp_col] = pd.to_datetime(df[timestamp_col])
+    # Columns parsed by read_csv are already datetime64 and are used as-is
+    ts = raw_data[timestamp_col]
+    if not pd.api.types.is_datetime64_any_dtype(ts):
+        ts = pd.to_datetime(ts)
+    df = raw_data.assign(**{timestamp_col: ts})
     df = df.sort_values(timestamp_col)
 
     if start_date is not None:
@@ -43,18 +103,20 @@ def clean_ws100_sensor(
 
 def aggregate_ws100_hourly(df: pd.DataFrame) -> pd.DataFrame:
   
-    hourly = df.copy()
-    hourly["Timestamp"] = pd.to_datetime(hourly["Timestamp"])
-    hourly = hourly.set_index("Timestamp")
+    ts = df["Timestamp"]
+    if not pd.api.types.is_datetime64_any_dtype(ts):
+        ts = pd.to_datetime(ts)
+    hourly = df.set_index(ts)
 
     # Hourly totals for rain
     hourly_agg = (hourly["Rain_mm"].resample("h").sum().to_frame(name="Rain_mm_hour"))
 
     if "precipitationType" in hourly.columns:
-        ptype_mode = (
-            hourly["precipitationType"].resample("h")
-            .agg(lambda x: x.mode()[0] if len(x.mode()) > 0 else np.nan).rename("ptype_code"))
-        hourly_agg = hourly_agg.join(ptype_mode)
-        hourly_agg["ptype_hour"] = hourly_agg["ptype_code"].apply(bucket_precip_type)
+        # Hours without any reading get NaN -> "NoData"
+        ptype_mode = hourly_mode(hourly["precipitationType"])
+        hourly_agg["ptype_code"] = ptype_mode.reindex(hourly_agg.index).astype(float)
+        hourly_agg["ptype_hour"] = pd.Categorical(
+            bucket_precip_types(hourly_agg["ptype_code"]), categories=PTYPE_CATEGORIES
+        )
 
     return hourly_agg.reset_index()
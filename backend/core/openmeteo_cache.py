@@ -0,0 +1,34 @@
+import time
+from datetime import datetime
+
+from backend.config import OPENMETEO_CACHE_DIR
+from backend.core.openmeteo_fetcher import fetch_openmeteo_jyvaskyla
+from backend.services.utils import read_cached_frame, write_cached_frame
+
+# How long a fetched forecast is reused across processes
+CACHE_TTL_S = 15 * 60
+
+
+def fetch_openmeteo_jyvaskyla_cached(forecast_days=10, ttl_s=CACHE_TTL_S):
+    """
+    fetch_openmeteo_jyvaskyla, pickled under OPENMETEO_CACHE_DIR so that separate
+    script runs within ttl_s seconds (and the same clock hour) skip the HTTP request.
+
+    Any problem with the cache (unreadable, read-only disk) falls back to a live fetch
+    (see read_cached_frame / write_cached_frame).
+    """
+    hour_key = datetime.now().strftime("%Y%m%d%H")
+    cache_path = OPENMETEO_CACHE_DIR / f"fc_{forecast_days}_{hour_key}.pkl"
+
+    try:
+        fresh = time.time() - cache_path.stat().st_mtime < ttl_s
+    except OSError:
+        fresh = False
+    if fresh:
+        df = read_cached_frame(cache_path)
+        if df is not None:
+            return df
+
+    df = fetch_openmeteo_jyvaskyla(forecast_days=forecast_days)
+    write_cached_frame(cache_path, df)
+    return df
@@ -1,11 +1,30 @@
+from datetime import datetime
+from functools import lru_cache
+
 import requests
+import numpy as np
 import pandas as pd
 
 # Jyväskylä coordinates
 JYV_LAT = 62.2415
 JYV_LON = 25.7209
 
+# One keep-alive session for all Open-Meteo calls (requests asks for gzip by default)
+_SESSION = requests.Session()
+
+
 def fetch_openmeteo_jyvaskyla(forecast_days=10):
+    """
+    Hourly Open-Meteo forecast for Jyväskylä. Responses are cached per clock hour,
+    so repeated calls within the same hour share one network round-trip.
+    """
+    hour_key = datetime.now().strftime("%Y-%m-%dT%H")
+    # Shallow copy: callers get their own frame (column buffers are shared with the cache)
+    return _fetch_cached(forecast_days, hour_key).copy(deep=False)
+
+
+@lru_cache(maxsize=8)
+def _fetch_cached(forecast_days, hour_key):
     url = "https://api.open-meteo.com/v1/forecast"
 
     hourly_vars = [
@@ -27,15 +46,14 @@ def fetch_openmeteo_jyvaskyla(forecast_days=10):
         "forecast_days": forecast_days,
         "timezone": "Europe/Helsinki",}
 
-    resp = requests.get(url, params=params, timeout=30)
+    resp = _SESSION.get(url, params=params, timeout=30)
     resp.raise_for_status()
 
     data = resp.json()
     hourly = data["hourly"]
 
-    df = pd.DataFrame({"time": hourly["time"]})
+    columns = {"time": pd.to_datetime(hourly["time"], format="ISO8601")}
     for var in hourly_vars:
-        df[var] = hourly[var]
+        columns[var] = np.asarray(hourly[var], dtype=float)
 
-    df["time"] = pd.to_datetime(df["time"])
-    return df
+    return pd.DataFrame(columns)
@@ -1,5 +1,7 @@
+import numpy as np
 import pandas as pd
 
+from .event_core import ensure_datetime, _is_precip
 from .physics import dewpoint_C, vpd_kpa
 from .thresholds import DEFAULT_THRESHOLDS, EnvironmentThresholds
 
@@ -11,122 +13,125 @@ def build_pair_hourly(
 ) -> pd.DataFrame:
    
     # LHT
-    lht = lht_hourly.copy()
-    lht["timestamp"] = pd.to_datetime(lht["Timestamp"])
-    lht = lht.sort_values("timestamp").drop_duplicates("timestamp")
-
-    lht["temp_C"] = lht["Temperature_C"].astype(float)
-    lht["rh_pct"] = lht["Humidity"].astype(float)
-    lht["dewpoint_C"] = dewpoint_C(lht["temp_C"], lht["rh_pct"])
-    lht["dp_spread_C"] = lht["temp_C"] - lht["dewpoint_C"]
-    lht["vpd_kpa"] = vpd_kpa(lht["temp_C"], lht["rh_pct"])
-    lht = lht[["timestamp", "temp_C", "rh_pct", "dewpoint_C", "dp_spread_C", "vpd_kpa"]]
+    lht = lht_hourly.set_index(ensure_datetime(lht_hourly["Timestamp"]).rename("timestamp"))
+    lht = lht.sort_index()
+    lht = lht[~lht.index.duplicated(keep="first")]
+
+    temp = lht["Temperature_C"].astype(float)
+    rh = lht["Humidity"].astype(float)
+    dewpoint = dewpoint_C(temp, rh)
+    lht = pd.DataFrame(
+        {
+            "temp_C": temp,
+            "rh_pct": rh,
+            "dewpoint_C": dewpoint,
+            "dp_spread_C": temp - dewpoint,
+            "vpd_kpa": vpd_kpa(temp, rh),
+        },
+        index=lht.index,
+    )
     lht = lht.interpolate(method="linear", limit=3, limit_direction="both", limit_area="inside")
 
     # WS100
-    ws = ws_hourly.copy()
-    ws["timestamp"] = pd.to_datetime(ws["Timestamp"])
-    ws = ws.sort_values("timestamp").drop_duplicates("timestamp")
+    ws = ws_hourly.set_index(ensure_datetime(ws_hourly["Timestamp"]).rename("timestamp"))
+    ws = ws.sort_index()
+    ws = ws[~ws.index.duplicated(keep="first")]
     ws = ws.rename(columns={"Rain_mm_hour": "rain_mm_hour"})
     if "ptype_hour" not in ws.columns:
-        ws["ptype_hour"] = "NoData"
-    ws = ws[["timestamp", "rain_mm_hour", "ptype_hour"]]
-
-    # Merge LHT + WS100
-    hourly = pd.merge(lht, ws, on="timestamp", how="left")
+        ws = ws.assign(ptype_hour="NoData")
+    to_join = [ws[["rain_mm_hour", "ptype_hour"]]]
 
     # Optional wind
+    wind_cols = ["wind_speed_kmh", "wind_direction_deg", "wind_gusts_kmh", "surface_pressure_hpa"]
     if wind_hourly is not None and not wind_hourly.empty:
-        wind = wind_hourly.copy()
-        wind["timestamp"] = pd.to_datetime(wind["Timestamp"])
-        wind = wind.sort_values("timestamp").drop_duplicates("timestamp")
-        
-        # Define all wind columns we want to keep
-        wind_cols = ["wind_speed_kmh", "wind_direction_deg", "wind_gusts_kmh", "surface_pressure_hpa"]
-        
+        wind = wind_hourly.set_index(ensure_datetime(wind_hourly["Timestamp"]).rename("timestamp"))
+        wind = wind.sort_index()
+        wind = wind[~wind.index.duplicated(keep="first")]
+
         # Ensure wind_speed_kmh exists (fallback logic)
         if "wind_speed_kmh" not in wind.columns:
             for col in wind.columns:
                 if "wind" in col and "speed" in col:
                     wind = wind.rename(columns={col: "wind_speed_kmh"})
                     break
-        
-        # Ensure all expected columns exist in wind df (fill missing with NaN)
-        for c in wind_cols:
-            if c not in wind.columns:
-                wind[c] = float("nan")
-
-        hourly = pd.merge(
-            hourly,
-            wind[["timestamp"] + wind_cols],
-            on="timestamp",
-            how="left",
-        )
-    else:
+
+        # Missing wind columns come back as NaN from the reindex
+        to_join.append(wind.reindex(columns=wind_cols))
+
+    # Join LHT + WS100 (+ wind) on the shared hourly DatetimeIndex
+    hourly = lht.join(to_join, how="left")
+    if len(to_join) == 1:
         hourly["wind_speed_kmh"] = 0.0
         hourly["wind_direction_deg"] = float("nan")
         hourly["wind_gusts_kmh"] = float("nan")
         hourly["surface_pressure_hpa"] = float("nan")
 
-    # Time parts
-    hourly["year"] = hourly["timestamp"].dt.year
-    hourly["month"] = hourly["timestamp"].dt.month
-    hourly["day"] = hourly["timestamp"].dt.day
-    hourly["date"] = hourly["timestamp"].dt.date
-    hourly["hour"] = hourly["timestamp"].dt.hour
+    # Time parts, computed once from the index
+    idx = hourly.index
+    hourly = hourly.reset_index()
+    hourly["year"] = idx.year
+    hourly["month"] = idx.month
+    hourly["day"] = idx.day
+    hourly["date"] = idx.date
+    hourly["hour"] = idx.hour
 
+    # Rows follow the sorted, de-duplicated LHT index: timestamps are strictly increasing
     return hourly
 
 
+def _drying_mask(rain, rh, dp_spread, vpd, wind, limits) -> np.ndarray:
+    """All drying conditions for one threshold level, ANDed into a single bool buffer in place."""
+    rain_max, rh_max, dp_spread_min, vpd_min, wind_min = limits
+    dry = rain <= rain_max
+    dry &= rh <= rh_max
+    dry &= dp_spread >= dp_spread_min
+    dry &= vpd >= vpd_min
+    dry &= wind >= wind_min
+    return dry
+
+
 def add_environment_flags(
     hourly_pair: pd.DataFrame,
     thresholds: EnvironmentThresholds | None = None,
 ) -> pd.DataFrame:
 
     th = thresholds or DEFAULT_THRESHOLDS
-    df = hourly_pair.copy()
+    df = hourly_pair
 
-    rain = df["rain_mm_hour"].fillna(0.0)
-    rh = df["rh_pct"].astype(float)
-    dp_spread = df["dp_spread_C"].astype(float)
-    vpd = df["vpd_kpa"].astype(float)
-    wind = df["wind_speed_kmh"].fillna(0.0).astype(float)
+    # Thresholds unpacked once: (rain max, RH max, dp-spread min, VPD min, wind min)
+    strict_limits = (
+        th.strict_rain_max_mm_h, th.strict_rh_max_pct, th.strict_dp_spread_min_C,
+        th.strict_vpd_min_kpa, th.strict_wind_min_kmh,
+    )
+    city_limits = (
+        th.city_rain_max_mm_h, th.city_rh_max_pct, th.city_dp_spread_min_C,
+        th.city_vpd_min_kpa, th.city_wind_min_kmh,
+    )
+
+    # Raw float arrays, extracted once; NaN rain/wind count as zero (zeroed in place on own copies)
+    rain = df["rain_mm_hour"].to_numpy(dtype=float, copy=True)
+    rain[np.isnan(rain)] = 0.0
+    rh = df["rh_pct"].to_numpy(dtype=float)
+    dp_spread = df["dp_spread_C"].to_numpy(dtype=float)
+    vpd = df["vpd_kpa"].to_numpy(dtype=float)
+    wind = df["wind_speed_kmh"].to_numpy(dtype=float, copy=True)
+    wind[np.isnan(wind)] = 0.0
 
     # Rain based on amount + WS100 type
-    df["is_raining"] = (rain > th.rain_event_mm_h) & df["ptype_hour"].isin(["Rain", "Mix", "Snow"])
+    is_raining = (rain > th.rain_event_mm_h) & _is_precip(df["ptype_hour"])
 
     # Leaf wetness without rain: high RH and small dewpoint spread
-    df["leaf_wetness"] = (rh >= th.leaf_wet_rh_pct) & (dp_spread <= th.leaf_wet_dp_spread_max_C)
-
-    # Any wet condition
-    df["wet_or_rain"] = df["is_raining"] | df["leaf_wetness"]
-
-    # Strict rural drying
-    no_rain_strict = rain <= th.strict_rain_max_mm_h
-    low_rh_strict = rh <= th.strict_rh_max_pct
-    good_spread_strict = dp_spread >= th.strict_dp_spread_min_C
-    strong_vpd_strict = vpd >= th.strict_vpd_min_kpa
-    enough_wind_strict = wind >= th.strict_wind_min_kmh
-    df["dry_enough_strict"] = (
-        no_rain_strict
-        & low_rh_strict
-        & good_spread_strict
-        & strong_vpd_strict
-        & enough_wind_strict
+    leaf_wetness = (rh >= th.leaf_wet_rh_pct) & (dp_spread <= th.leaf_wet_dp_spread_max_C)
+
+    # Strict rural drying / city (moderate) drying
+    dry_strict = _drying_mask(rain, rh, dp_spread, vpd, wind, strict_limits)
+    dry_city = _drying_mask(rain, rh, dp_spread, vpd, wind, city_limits)
+
+    return df.assign(
+        is_raining=is_raining,
+        leaf_wetness=leaf_wetness,
+        # Any wet condition
+        wet_or_rain=is_raining | leaf_wetness,
+        dry_enough_strict=dry_strict,
+        dry_enough_city=dry_city,
     )
-
-    # City / moderate drying
-    no_rain_city = rain <= th.city_rain_max_mm_h
-    low_rh_city = rh <= th.city_rh_max_pct
-    good_spread_city = dp_spread >= th.city_dp_spread_min_C
-    vpd_ok_city = vpd >= th.city_vpd_min_kpa
-    enough_wind_city = wind >= th.city_wind_min_kmh
-    df["dry_enough_city"] = (
-        no_rain_city
-        & low_rh_city
-        & good_spread_city
-        & vpd_ok_city
-        & enough_wind_city
-    )
-
-    return df
@@ -1,30 +1,71 @@
 import numpy as np
+import pandas as pd
 
 
 
+def _as_float_array(x):
+    """Float ndarray view of x; float32 input stays float32, everything else is float64."""
+    arr = np.asarray(x)
+    return arr if arr.dtype == np.float32 else arr.astype(np.float64, copy=False)
+
+
+def _like_input(result, *inputs):
+    """result as a Series on the index of the first Series input (the math itself is positional)."""
+    for x in inputs:
+        if isinstance(x, pd.Series):
+            return pd.Series(result, index=x.index)
+    return result
+
+
 def dewpoint_C(temperature, humidity):
-    b = np.where(temperature >= 0, 17.625, 22.46)
-    c = np.where(temperature >= 0, 243.04, 272.62)
-    rh_frac = np.clip(humidity, 1e-6, 100) / 100.0
-    gamma = np.log(rh_frac) + (b * temperature) / (c + temperature)
-    return (c * gamma) / (b - gamma)
+    """
+    Dew point (°C) from temperature (°C) and relative humidity (%).
+    Returns a Series on the input's index for Series input, else an ndarray
+    (a NumPy scalar for scalar input).
+    """
+    # Magnus coefficients over water (T >= 0) and ice (T < 0); each half of the
+    # array only gets its own coefficients instead of evaluating both branches.
+    T, RH = np.broadcast_arrays(_as_float_array(temperature), _as_float_array(humidity))
+    # Same as log(clip(RH, 1e-6, 100) / 100), but clipped and logged in place
+    log_rh = np.asarray(RH / 100.0)
+    np.clip(log_rh, 1e-6 / 100.0, 1.0, out=log_rh)
+    np.log(log_rh, out=log_rh)
+    out = np.empty(T.shape, dtype=np.result_type(T, RH))
+    water = T >= 0
+    for mask, b, c in ((water, 17.625, 243.04), (~water, 22.46, 272.62)):
+        t = T[mask]
+        gamma = log_rh[mask] + (b * t) / (c + t)
+        out[mask] = (c * gamma) / (b - gamma)
+    return _like_input(out[()], temperature, humidity)
 
 
 def svp_kpa_piecewise(Tc):
-    Tc_arr = np.asarray(Tc, dtype=float)
-    svp_liquid = 0.6108 * np.exp(17.27 * Tc_arr / (Tc_arr + 237.3))
-    svp_ice = 0.6108 * np.exp(21.87 * Tc_arr / (Tc_arr + 265.5))
-    svp = np.where(Tc_arr >= 0.0, svp_liquid, svp_ice)
+    """Saturation vapour pressure (kPa) over water / ice; always an ndarray, also for Series input."""
+    Tc_arr = _as_float_array(Tc)
+    svp = np.empty_like(Tc_arr)
+    liquid = Tc_arr >= 0.0
+    T_liq = Tc_arr[liquid]
+    T_ice = Tc_arr[~liquid]
+    # exp is only evaluated once per element, for the branch that applies
+    svp[liquid] = 0.6108 * np.exp(17.27 * T_liq / (T_liq + 237.3))
+    svp[~liquid] = 0.6108 * np.exp(21.87 * T_ice / (T_ice + 265.5))
     return svp
 
 
 def vpd_kpa(Tc, RH):
-    svp = svp_kpa_piecewise(Tc)
-    return svp * (1 - RH / 100.0)
+    """
+    Vapour pressure deficit (kPa). Returns a Series on the input's index for
+    Series input, else an ndarray (a NumPy scalar for scalar input).
+    """
+    T, RH = np.broadcast_arrays(_as_float_array(Tc), _as_float_array(RH))
+    # svp is a fresh array, so the RH deficit is applied in place (no extra temporaries)
+    vpd = svp_kpa_piecewise(T)
+    vpd *= 1 - RH / 100.0
+    return _like_input(vpd[()], Tc, RH)
 
 
 
-def abs_humidity_gm3(Tc, RH):
+def abs_humidity_gm3(Tc, RH, rh_validated=False):
     """
     Calculate absolute humidity in g/m³ using ideal gas law.
     
@@ -38,12 +79,18 @@ def abs_humidity_gm3(Tc, RH):
     Args:
         Tc: Temperature in Celsius
         RH: Relative humidity (0-100%)
+        rh_validated: RH is already known to be within 0-100 (e.g. after
+            clean_lht_sensor), so the clip copy can be skipped
     
     Returns:
-        Absolute humidity in g/m³
+        Absolute humidity in g/m³: a Series on the input's index for Series
+        input, else an ndarray (a NumPy scalar for scalar input)
     """
-    svp_pa = svp_kpa_piecewise(Tc) * 1000.0  # Convert kPa to Pa
-    vapor_pressure_pa = np.clip(RH, 0, 100) / 100.0 * svp_pa
-    T_kelvin = Tc + 273.15
-    return 2.16679 * vapor_pressure_pa / T_kelvin
+    T, RH = np.broadcast_arrays(_as_float_array(Tc), _as_float_array(RH))
+    # Accumulate in place on the fresh svp array instead of allocating a temporary per step
+    ah = svp_kpa_piecewise(T)
+    ah *= RH if rh_validated else np.clip(RH, 0, 100)
+    ah *= 2.16679 * 1000.0 / 100.0  # kPa -> Pa and % -> fraction
+    ah /= T + 273.15
+    return _like_input(ah[()], Tc, RH)
 
@@ -2,8 +2,9 @@
 from __future__ import annotations
 from dataclasses import dataclass
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class EnvironmentThresholds:
+    # slots: attribute reads hit a C slot and instances carry no __dict__
 
     rain_event_mm_h: float = 0.2  
 
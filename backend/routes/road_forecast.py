@@ -1,5 +1,4 @@
 from fastapi import APIRouter, Query
-from backend.services.road_forecast_service import build_city_road_forecast
 
 router = APIRouter(prefix="/api/road-forecast", tags=["road-forecast"])
 
@@ -13,5 +12,8 @@ def get_city_road_forecast(
     - events: forecast events with intensity + drying info
     - stats: high-risk hours, etc.
     """
+    # Imported lazily: pulls in pandas and the forecast pipeline
+    from backend.services.road_forecast_service import build_city_road_forecast
+
     summary = build_city_road_forecast(forecast_days=forecast_days)
     return summary
@@ -4,7 +4,9 @@ This module follows the simple patterns used in other services (lht_service, ws1
 """
 from pathlib import Path
 from datetime import datetime, timedelta
+from functools import lru_cache
 from zoneinfo import ZoneInfo
+import numpy as np
 import pandas as pd
 from backend.config import FORECAST_DATA_PATH, CLEANED_DATA_ROOT
 
@@ -12,39 +14,85 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Numeric columns of the Open-Meteo forecast CSV. Columns the summary reports
+# (echoed or summed into the JSON) stay float64 so the published numbers don't
+# pick up float32 representation noise; the rest are float32 (0.1-unit source
+# precision) to shrink the cached frame.
+FORECAST_DTYPES = {
+    "temperature_2m": "float64",
+    "relativehumidity_2m": "float64",
+    "dewpoint_2m": "float32",
+    "precipitation": "float64",
+    "rain": "float64",
+    "snowfall": "float64",
+    "windspeed_10m": "float32",
+    "winddirection_10m": "float32",
+    "surface_pressure": "float32",
+}
+
+
+def _resolve_forecast_path() -> Path:
+    """Configured forecast CSV, falling back to the legacy file in CLEANED_DATA_ROOT."""
+    p = Path(FORECAST_DATA_PATH)
+    if not p.exists():
+        alt = Path(CLEANED_DATA_ROOT) / "jyvaskyla_weather_forecast.csv"
+        if alt.exists():
+            return alt
+        raise FileNotFoundError(f"Forecast CSV not found at {FORECAST_DATA_PATH}")
+    return p
+
+
+@lru_cache(maxsize=4)
+def _load_forecast_df_cached(path: str, mtime_ns: int) -> pd.DataFrame:
+    """
+    Parse the forecast CSV once per file version (mtime_ns is only part of the cache key).
+    The returned frame is shared between requests and must not be mutated.
+    """
+    # Explicit dtypes and an ISO8601 time format skip per-column inference;
+    # tz is normalized afterwards
+    df = pd.read_csv(
+        path,
+        dtype=FORECAST_DTYPES,
+        parse_dates=["time"],
+        date_format="ISO8601",
+    )
+
+    helsinki = ZoneInfo("Europe/Helsinki")
+    if "time" in df.columns:
+        if not pd.api.types.is_datetime64_any_dtype(df["time"]):
+            df["time"] = pd.to_datetime(df["time"], errors="coerce")
+        # if timestamps are naive, localize to Helsinki; if aware, convert
+        if df["time"].dt.tz is None:
+            df["time"] = df["time"].dt.tz_localize(helsinki)
+        else:
+            df["time"] = df["time"].dt.tz_convert(helsinki)
+
+    if df is None or df.empty:
+        raise ValueError("Forecast CSV parsed but contained no rows")
+
+    # Unparseable times can never fall in a window; keep the rest sorted so
+    # _split_current_and_window can binary-search it
+    if "time" in df.columns:
+        df = df.dropna(subset=["time"])
+        if not df["time"].is_monotonic_increasing:
+            df = df.sort_values("time", kind="stable")
+
+    return df
+
 
 def _load_forecast_df() -> pd.DataFrame | None:
     """
     Load forecast CSV, parse 'time' and ensure timestamps are timezone-aware in Europe/Helsinki.
 
     Implements the same fallback logic as before (configured path -> legacy file in CLEANED_DATA_ROOT).
-    Returns None if file missing or parsing fails.
+    Parsed frames are cached per (path, mtime), so repeat requests skip the CSV read until
+    the file changes. Returns None if file missing or parsing fails.
     """
     try:
-        p = Path(FORECAST_DATA_PATH)
-        if not p.exists():
-            alt = Path(CLEANED_DATA_ROOT) / "jyvaskyla_weather_forecast.csv"
-            if alt.exists():
-                p = alt
-            else:
-                raise FileNotFoundError(f"Forecast CSV not found at {FORECAST_DATA_PATH}")
-
-        # Read without forcing tz parsing; we'll normalize afterwards
-        df = pd.read_csv(p, parse_dates=["time"])
-
-        helsinki = ZoneInfo("Europe/Helsinki")
-        if "time" in df.columns:
-            df["time"] = pd.to_datetime(df["time"], errors="coerce")
-            # if timestamps are naive, localize to Helsinki; if aware, convert
-            if df["time"].dt.tz is None:
-                df["time"] = df["time"].dt.tz_localize(helsinki)
-            else:
-                df["time"] = df["time"].dt.tz_convert(helsinki)
-
-        if df is None or df.empty:
-            raise ValueError("Forecast CSV parsed but contained no rows")
-
-        return df
+        p = _resolve_forecast_path()
+        df = _load_forecast_df_cached(str(p), p.stat().st_mtime_ns)
+        # Shallow copy: callers may replace columns without touching the cached frame
+        return df.copy(deep=False)
     except Exception:
         logger.exception("Failed to load forecast CSV")
         return None
@@ -52,7 +100,9 @@ def _load_forecast_df() -> pd.DataFrame | None:
 
 def _split_current_and_window(df: pd.DataFrame):
     """
-    Given a forecast dataframe with tz-aware 'time', return (current_row_series, window_df).
+    Given a forecast dataframe with datetime 'time' (normally already in Europe/Helsinki,
+    as returned by _load_forecast_df; naive times are taken as Helsinki wall-clock),
+    return (current_row_series, window_df).
 
     current: single pandas Series for the current hour (now rounded down to hour). If exact match
     is missing, returns the nearest future row. If still missing, returns (None, None).
@@ -63,37 +113,47 @@ def _split_current_and_window(df: pd.DataFrame):
     now = datetime.now(tz).replace(minute=0, second=0, microsecond=0)
     end = now + timedelta(days=10)
 
-    # Ensure times are in Helsinki tz
-    if df["time"].dt.tz is None:
-        df["time"] = df["time"].dt.tz_localize(tz)
-    else:
-        df["time"] = df["time"].dt.tz_convert(tz)
-
-    # Window for 10-day summary
-    window = df[(df["time"] >= now) & (df["time"] <= end)].copy()
-
-    # Debug print window bounds
-    if not window.empty:
-        first_ts = window["time"].iloc[0]
-        last_ts = window["time"].iloc[-1]
-        print(f"[forecast_service] using forecast window from {first_ts} to {last_ts} (requested {now} -> {end})")
-    else:
-        print(f"[forecast_service] no forecast rows in window {now} -> {end}")
-
-    # Current hour row – prefer the first row in the window with time >= now (truncated)
-    # If none found, fall back to the last available row in the window.
-    current_row = window.loc[window["time"] >= now]
-    if current_row.empty:
-        # fallback to last row in window
+    # tz normalization happens once per file version in _load_forecast_df_cached;
+    # frames from elsewhere are localized (naive) or converted here, through
+    # assign so the caller's frame is left untouched
+    time_tz = df["time"].dt.tz
+    if time_tz is None:
+        df = df.assign(time=df["time"].dt.tz_localize(tz))
+    elif str(time_tz) != "Europe/Helsinki":
+        df = df.assign(time=df["time"].dt.tz_convert(tz))
+
+    # Window for 10-day summary: time is sorted, so the bounds are two binary searches
+    # and the window is a plain slice (read-only downstream, no copy needed)
+    lo = df["time"].searchsorted(now, side="left")
+    hi = df["time"].searchsorted(end, side="right")
+    window = df.iloc[lo:hi]
+
+    # Debug log window bounds (formatting only happens when DEBUG is enabled)
+    if logger.isEnabledFor(logging.DEBUG):
         if not window.empty:
-            current = window.iloc[-1]
-            return current, window
+            logger.debug(
+                "using forecast window from %s to %s (requested %s -> %s)",
+                window["time"].iloc[0], window["time"].iloc[-1], now, end,
+            )
+        else:
+            logger.debug("no forecast rows in window %s -> %s", now, end)
+
+    # Current hour row: the window starts at the first row with time >= now (truncated)
+    if window.empty:
         return None, None
 
-    current = current_row.iloc[0]
+    current = window.iloc[0]
     return current, window
 
 
+def _mean_min_max(values: np.ndarray) -> tuple[float, float, float]:
+    """NaN-skipping mean/min/max of a float array (all NaN if there is no valid value)."""
+    valid = values[~np.isnan(values)]
+    if valid.size == 0:
+        return float("nan"), float("nan"), float("nan")
+    return float(valid.mean()), float(valid.min()), float(valid.max())
+
+
 def summary_10d() -> dict:
     """
     Return JSON containing current hour values and 10-day aggregates.
@@ -120,42 +180,51 @@ def summary_10d() -> dict:
         curr_temp = float(current["temperature_2m"]) if "temperature_2m" in current.index else None
         curr_rh = float(current["relativehumidity_2m"]) if "relativehumidity_2m" in current.index else None
 
-        # 10-day aggregates
+        # 10-day aggregates, straight on the column arrays (NaN-skipping like pandas)
         win = window
-        avg_temp = float(win["temperature_2m"].mean()) if "temperature_2m" in win.columns else None
-        min_temp = float(win["temperature_2m"].min()) if "temperature_2m" in win.columns else None
-        max_temp = float(win["temperature_2m"].max()) if "temperature_2m" in win.columns else None
+        avg_temp = min_temp = max_temp = None
+        if "temperature_2m" in win.columns:
+            avg_temp, min_temp, max_temp = _mean_min_max(win["temperature_2m"].to_numpy(dtype=float))
 
-        avg_rh = float(win["relativehumidity_2m"].mean()) if "relativehumidity_2m" in win.columns else None
-        high_rh_pct = float((win["relativehumidity_2m"] >= 90).mean() * 100.0) if "relativehumidity_2m" in win.columns else None
+        avg_rh = high_rh_pct = None
+        if "relativehumidity_2m" in win.columns:
+            rh = win["relativehumidity_2m"].to_numpy(dtype=float)
+            avg_rh = _mean_min_max(rh)[0]
+            high_rh_pct = float(np.count_nonzero(rh >= 90) / rh.size * 100.0)
 
         rain_col = "rain" if "rain" in win.columns else ("precipitation" if "precipitation" in win.columns else None)
-        total_rain = float(win[rain_col].sum()) if rain_col is not None else 0.0
-        rainy_hours = int((win[rain_col] > 0.1).sum()) if rain_col is not None else 0
+        total_rain, rainy_hours = 0.0, 0
+        if rain_col is not None:
+            rain = win[rain_col].to_numpy(dtype=float)
+            total_rain = float(np.nansum(rain))
+            rainy_hours = int(np.count_nonzero(rain > 0.1))
+
+        total_snow = float(np.nansum(win["snowfall"].to_numpy(dtype=float))) if "snowfall" in win.columns else 0.0
 
-        total_snow = float(win["snowfall"].sum()) if "snowfall" in win.columns else 0.0
+        # Everything above is already a plain Python float/int (or None); format the time once
+        ts_iso = current["time"].isoformat()
 
         # Also expose flat current_* fields for easier frontend consumption
         return {
             "has_data": True,
             "current": {
-                "timestamp": current["time"].isoformat(),
+                "timestamp": ts_iso,
                 "temp_C": curr_temp,
                 "rh_pct": curr_rh,
             },
             # flat current_* fields
-            "current_time": current["time"].isoformat(),
-            "current_temp": float(curr_temp) if curr_temp is not None else None,
-            "current_rh": float(curr_rh) if curr_rh is not None else None,
+            "current_time": ts_iso,
+            "current_temp": curr_temp,
+            "current_rh": curr_rh,
             "summary_10d": {
-                "avg_temp": float(avg_temp) if avg_temp is not None else None,
-                "min_temp": float(min_temp) if min_temp is not None else None,
-                "max_temp": float(max_temp) if max_temp is not None else None,
-                "avg_rh": float(avg_rh) if avg_rh is not None else None,
-                "high_rh_pct": float(high_rh_pct) if high_rh_pct is not None else None,
-                "total_rain_mm": float(total_rain),
-                "rainy_hours": int(rainy_hours),
-                "total_snow_mm": float(total_snow),
+                "avg_temp": avg_temp,
+                "min_temp": min_temp,
+                "max_temp": max_temp,
+                "avg_rh": avg_rh,
+                "high_rh_pct": high_rh_pct,
+                "total_rain_mm": total_rain,
+                "rainy_hours": rainy_hours,
+                "total_snow_mm": total_snow,
             },
         }
     except Exception:
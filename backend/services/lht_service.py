@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 import pandas as pd
 import numpy as np
@@ -17,7 +19,14 @@ def demo_summary() -> dict:
 
     This is only for testing the backend wiring. Later we will
     replace the synthetic data with real CSV loading.
+
+    The input is constant, so the summary is computed once and copied per call.
     """
+    return dict(_demo_summary_cached())
+
+
+@lru_cache(maxsize=1)
+def _demo_summary_cached() -> dict:
     # Create a simple 24-hour synthetic time series
     # Use lowercase 'h' for hourly frequency to avoid pandas FutureWarning
     timestamps = pd.date_range("2023-07-01 00:00:00", periods=24, freq="h")
@@ -48,11 +57,71 @@ def list_sensors() -> list[str]:
     Returns:
         List of sensor names, e.g. ['Kaunisharjunti', 'Keltimaentie', ...]
     """
-    if not LHT_DATA_DIR.exists():
+    try:
+        dir_mtime_ns = LHT_DATA_DIR.stat().st_mtime_ns
+    except FileNotFoundError:
         return []
     
+    # The directory mtime changes whenever a file is added, removed or renamed,
+    # so one stat() replaces the directory scan on a warm cache
+    return list(_list_sensors_cached(dir_mtime_ns))
+
+
+@lru_cache(maxsize=1)
+def _list_sensors_cached(dir_mtime_ns: int) -> tuple[str, ...]:
     csv_files = LHT_DATA_DIR.glob("*.csv")
-    return sorted([f.stem for f in csv_files])
+    return tuple(sorted([f.stem for f in csv_files]))
+
+
+@lru_cache(maxsize=32)
+def _prepared(csv_path: str, mtime_ns: int) -> pd.DataFrame:
+    """
+    read_csv -> clean_lht_sensor -> prepare_and_features for one sensor file.
+    Cached per (path, mtime), so a changed CSV is picked up automatically.
+    The cached frame is shared and must not be mutated; use _load_prepared().
+    """
+    # Timestamps are parsed by the C reader in the same pass as the numbers
+    raw_df = pd.read_csv(csv_path, parse_dates=["Timestamp"], date_format="ISO8601")
+    return prepare_and_features(clean_lht_sensor(raw_df))
+
+
+def _load_prepared(sensor_name: str) -> pd.DataFrame:
+    """
+    Prepared dataframe for a sensor, as a shallow copy of the cached frame so
+    callers can add or replace columns freely (but not write into existing ones).
+
+    Raises:
+        FileNotFoundError: If the sensor CSV does not exist
+    """
+    csv_path = LHT_DATA_DIR / f"{sensor_name}.csv"
+    
+    if not csv_path.exists():
+        available = list_sensors()
+        raise FileNotFoundError(
+            f"Sensor '{sensor_name}' not found. "
+            f"Available sensors: {', '.join(available) if available else 'none'}"
+        )
+
+    return _prepared(str(csv_path), csv_path.stat().st_mtime_ns).copy(deep=False)
+
+
+def _contiguous_date_range(year, month, day):
+    """
+    Half-open [start, end) Timestamp range matching the year/month/day filter, or
+    None if the filter does not select one contiguous range (no year, or a day
+    without a month). A date that doesn't exist (e.g. Feb 30) gives an empty range.
+    """
+    if not year or (day and not month):
+        return None
+    try:
+        start = pd.Timestamp(year=year, month=month or 1, day=day or 1)
+    except ValueError:
+        return pd.Timestamp.max, pd.Timestamp.max
+    if day:
+        return start, start + pd.DateOffset(days=1)
+    if month:
+        return start, start + pd.DateOffset(months=1)
+    return start, start + pd.DateOffset(years=1)
 
 
 def sensor_summary(
@@ -76,37 +145,30 @@ def sensor_summary(
     Raises:
         FileNotFoundError: If the sensor CSV does not exist
     """
-    csv_path = LHT_DATA_DIR / f"{sensor_name}.csv"
-    
-    if not csv_path.exists():
-        available = list_sensors()
-        raise FileNotFoundError(
-            f"Sensor '{sensor_name}' not found. "
-            f"Available sensors: {', '.join(available) if available else 'none'}"
-        )
-    
-    # Load the CSV
-    raw_df = pd.read_csv(csv_path)
-    
-    # Run the LHT pipeline
-    df_clean = clean_lht_sensor(raw_df)
+    # Cleaned + feature-engineered frame (cached per file version)
+    df_clean = _load_prepared(sensor_name)
     
     # Filter by date if requested
     if year or month or day:
-        # Ensure timestamp is datetime
-        if not pd.api.types.is_datetime64_any_dtype(df_clean['Timestamp']):
-            df_clean['Timestamp'] = pd.to_datetime(df_clean['Timestamp'])
-            
-        mask = pd.Series(True, index=df_clean.index)
-        
-        if year:
-            mask &= (df_clean['Timestamp'].dt.year == year)
-        if month:
-            mask &= (df_clean['Timestamp'].dt.month == month)
-        if day:
-            mask &= (df_clean['Timestamp'].dt.day == day)
-            
-        df_clean = df_clean[mask]
+        bounds = _contiguous_date_range(year, month, day)
+        if bounds is not None:
+            # Prepared frames are sorted by Timestamp: slice [start, end) via binary search
+            ts = df_clean['Timestamp']
+            lo = ts.searchsorted(bounds[0], side='left')
+            hi = ts.searchsorted(bounds[1], side='left')
+            df_clean = df_clean.iloc[lo:hi]
+        else:
+            # e.g. "every July" or "the 5th of every month": not one time range
+            mask = pd.Series(True, index=df_clean.index)
+
+            if year:
+                mask &= (df_clean['Timestamp'].dt.year == year)
+            if month:
+                mask &= (df_clean['Timestamp'].dt.month == month)
+            if day:
+                mask &= (df_clean['Timestamp'].dt.day == day)
+
+            df_clean = df_clean[mask]
         
         if df_clean.empty:
             # Return empty stats structure if no data matches
@@ -120,12 +182,47 @@ def sensor_summary(
                 "%RH>=90": 0, "%RH<=30": 0
             }
 
-    df_prep = prepare_and_features(df_clean)
-    stats = summarize(df_prep)
+    # prepare_and_features is row-wise, so filtering the prepared frame gives
+    # the same rows as preparing the filtered one
+    stats = summarize(df_clean)
     
     return stats
 
 
+def _sensor_versions(sensor_names: list[str]) -> tuple:
+    """(sensor, csv path, mtime_ns) for every sensor whose data file still exists."""
+    versions = []
+    for name in sensor_names:
+        csv_path = LHT_DATA_DIR / f"{name}.csv"
+        try:
+            versions.append((name, str(csv_path), csv_path.stat().st_mtime_ns))
+        except FileNotFoundError:
+            continue
+    return tuple(versions)
+
+
+def _summarize_version(version: tuple) -> dict:
+    """summarize() of one sensor's cached prepared frame (read-only, so no copy)."""
+    _, csv_path, mtime_ns = version
+    return summarize(_prepared(csv_path, mtime_ns))
+
+
+@lru_cache(maxsize=4)
+def _network_frame(versions: tuple) -> pd.DataFrame:
+    """
+    One row of summary stats per sensor, for a given set of file versions.
+    The network-wide table is built once and shared by every network_summary()
+    call until a sensor file is added, removed or changed.
+    """
+    # The sensors are independent and CSV parsing / NumPy kernels release the
+    # GIL, so a small thread pool overlaps them on a cold cache.
+    with ThreadPoolExecutor(max_workers=min(8, len(versions))) as pool:
+        records = list(pool.map(_summarize_version, versions))
+
+    # Rows-first (no transpose). All summary values are numeric -> float64 columns.
+    return pd.DataFrame.from_records(records, index=[v[0] for v in versions]).astype(float)
+
+
 def network_summary() -> dict:
     """
     Load all LHT sensors, compute summaries, and return network-wide comparisons.
@@ -146,24 +243,18 @@ def network_summary() -> dict:
             "network_mean": {}
         }
     
-    # Collect summaries for all sensors
-    summaries = {}
-    for name in sensor_names:
-        try:
-            summaries[name] = sensor_summary(name)
-        except FileNotFoundError:
-            # Skip sensors that don't have data files
-            continue
+    # Sensors that have data files, keyed by file version
+    versions = _sensor_versions(sensor_names)
     
-    if not summaries:
+    if not versions:
         return {
             "per_location": [],
             "vs_network_mean": [],
             "network_mean": {}
         }
     
-    # Convert to DataFrame for easier manipulation
-    df = pd.DataFrame(summaries).T
+    # One row per station (cached per set of file versions)
+    df = _network_frame(versions)
     
     # Columns to include in comparison (numeric metrics only)
     numeric_cols = [
@@ -198,6 +289,15 @@ def network_summary() -> dict:
     }
 
 
+def _bincount_nanmean(codes: np.ndarray, values: np.ndarray, n: int) -> np.ndarray:
+    """Per-code mean of values, skipping NaN like pandas (NaN where a code has no valid value)."""
+    valid = ~np.isnan(values)
+    sums = np.bincount(codes[valid], weights=values[valid], minlength=n)
+    counts = np.bincount(codes[valid], minlength=n)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return sums / counts
+
+
 def sensor_timeseries(sensor_name: str, year: int = None, freq: str = 'M') -> dict:
     """
     Get time-series aggregations for a sensor (monthly or daily).
@@ -215,19 +315,8 @@ def sensor_timeseries(sensor_name: str, year: int = None, freq: str = 'M') -> di
             "data": [{"timestamp": "2023-01", "T_mean": 5.2, "VPD_mean": 0.4, "RH90_pct": 65.0}, ...]
         }
     """
-    csv_path = LHT_DATA_DIR / f"{sensor_name}.csv"
-    
-    if not csv_path.exists():
-        available = list_sensors()
-        raise FileNotFoundError(
-            f"Sensor '{sensor_name}' not found. "
-            f"Available sensors: {', '.join(available) if available else 'none'}"
-        )
-    
     # Load and prepare data
-    raw_df = pd.read_csv(csv_path)
-    df_clean = clean_lht_sensor(raw_df)
-    df = prepare_and_features(df_clean)
+    df = _load_prepared(sensor_name)
     
     # Add year/month/day columns
     df['year'] = df['Timestamp'].dt.year
@@ -246,38 +335,35 @@ def sensor_timeseries(sensor_name: str, year: int = None, freq: str = 'M') -> di
             "data": []
         }
     
-    # Aggregate by frequency
+    # Aggregate by frequency: integer period codes (months / days since the first
+    # period) and np.bincount sums instead of a pandas groupby
     if freq == 'M':
-        # Monthly aggregation
-        df['period'] = df['Timestamp'].dt.to_period('M')
-        grouped = df.groupby('period').agg(
-            T_mean=('Temperature_C', 'mean'),
-            VPD_mean=('VPD_kPa', 'mean'),
-            RH90_pct=('Humidity', lambda x: (x >= 90).mean() * 100)
-        ).reset_index()
-        grouped['timestamp'] = grouped['period'].astype(str)
-        
+        unit = 'M'  # Monthly aggregation
     elif freq == 'D':
-        # Daily aggregation
-        df['period'] = df['Timestamp'].dt.date
-        grouped = df.groupby('period').agg(
-            T_mean=('Temperature_C', 'mean'),
-            VPD_mean=('VPD_kPa', 'mean'),
-            RH90_pct=('Humidity', lambda x: (x >= 90).mean() * 100)
-        ).reset_index()
-        grouped['timestamp'] = grouped['period'].astype(str)
+        unit = 'D'  # Daily aggregation
     else:
         raise ValueError(f"Invalid freq '{freq}'. Use 'M' or 'D'.")
-    
-    # Convert to list of dicts
+    period = df['Timestamp'].to_numpy(dtype='datetime64[ns]').astype(f'datetime64[{unit}]').astype(np.int64)
+    first = period.min()
+    codes = period - first
+    counts = np.bincount(codes)
+    present = np.flatnonzero(counts)  # periods that have rows, in time order
+
+    # Share of RH >= 90 rows; rows with missing humidity count as "not >= 90"
+    rh90 = np.bincount(codes, weights=df['Humidity'].to_numpy(dtype=float) >= 90, minlength=len(counts))
+
+    grouped = pd.DataFrame({
+        # "2023-01" / "2023-01-05" labels, formatted only for the aggregated rows
+        'timestamp': np.datetime_as_string((present + first).astype(f'datetime64[{unit}]')),
+        'T_mean': _bincount_nanmean(codes, df['Temperature_C'].to_numpy(dtype=float), len(counts))[present],
+        'VPD_mean': _bincount_nanmean(codes, df['VPD_kPa'].to_numpy(dtype=float), len(counts))[present],
+        'RH90_pct': rh90[present] / counts[present] * 100,
+    })
+    
+    # Round values (vectorised), then convert to list of dicts
+    grouped = grouped.round({'T_mean': 2, 'VPD_mean': 2, 'RH90_pct': 1})
     data = grouped[['timestamp', 'T_mean', 'VPD_mean', 'RH90_pct']].to_dict('records')
     
-    # Round values
-    for record in data:
-        record['T_mean'] = round(record['T_mean'], 2)
-        record['VPD_mean'] = round(record['VPD_mean'], 2)
-        record['RH90_pct'] = round(record['RH90_pct'], 1)
-    
     return {
         "sensor": sensor_name,
         "freq": freq,
@@ -301,24 +387,15 @@ def sensor_daily_detail(sensor_name: str, date: str) -> dict:
             "hourly_data": [{"hour": 0, "Temperature_C": 15.2, "Humidity": 85.0, "VPD_kPa": 0.25, "AbsHum_gm3": 10.5}, ...]
         }
     """
-    csv_path = LHT_DATA_DIR / f"{sensor_name}.csv"
-    
-    if not csv_path.exists():
-        available = list_sensors()
-        raise FileNotFoundError(
-            f"Sensor '{sensor_name}' not found. "
-            f"Available sensors: {', '.join(available) if available else 'none'}"
-        )
-    
     # Load and prepare data
-    raw_df = pd.read_csv(csv_path)
-    df_clean = clean_lht_sensor(raw_df)
-    df = prepare_and_features(df_clean)
+    df = _load_prepared(sensor_name)
     
-    # Filter by date
-    df['date_only'] = df['Timestamp'].dt.date
-    target_date = pd.to_datetime(date).date()
-    df_day = df[df['date_only'] == target_date].copy()
+    # Filter by date: the prepared frame is sorted by Timestamp, so the day is
+    # one [midnight, next midnight) slice found by binary search
+    day_start = pd.to_datetime(date).normalize()
+    lo = df['Timestamp'].searchsorted(day_start, side='left')
+    hi = df['Timestamp'].searchsorted(day_start + pd.Timedelta(days=1), side='left')
+    df_day = df.iloc[lo:hi]
     
     if df_day.empty:
         return {
@@ -327,19 +404,13 @@ def sensor_daily_detail(sensor_name: str, date: str) -> dict:
             "hourly_data": []
         }
     
-    # Sort by timestamp
-    df_day = df_day.sort_values('Timestamp')
-    df_day['hour'] = df_day['Timestamp'].dt.hour
-    
-    # Select columns and convert to records
-    hourly_data = df_day[['hour', 'Temperature_C', 'Humidity', 'VPD_kPa', 'AbsHum_gm3']].to_dict('records')
-    
-    # Round values
-    for record in hourly_data:
-        record['Temperature_C'] = round(record['Temperature_C'], 2)
-        record['Humidity'] = round(record['Humidity'], 1)
-        record['VPD_kPa'] = round(record['VPD_kPa'], 3)
-        record['AbsHum_gm3'] = round(record['AbsHum_gm3'], 2)
+    # Already in timestamp order; 'hour' comes from prepare_and_features
+    # Select columns, round values (vectorised) and convert to records
+    hourly_data = (
+        df_day[['hour', 'Temperature_C', 'Humidity', 'VPD_kPa', 'AbsHum_gm3']]
+        .round({'Temperature_C': 2, 'Humidity': 1, 'VPD_kPa': 3, 'AbsHum_gm3': 2})
+        .to_dict('records')
+    )
     
     return {
         "sensor": sensor_name,
@@ -1,30 +1,49 @@
+from collections.abc import Iterator
 from pathlib import Path
+from functools import lru_cache
 import numpy as np
-import math
-from collections.abc import Mapping, Sequence
 
 import pandas as pd
-from fastapi import FastAPI, HTTPException
-from backend.services import pair_service
-
-import numpy as np 
-from backend.config import LHT_DATA_DIR, WS100_DATA_DIR, WIND_DATA_PATH
+from backend.config import LHT_DATA_DIR, WS100_DATA_DIR, WIND_DATA_PATH, HOURLY_CACHE_DIR
 from backend.core.io_lht import clean_lht_sensor, aggregate_lht_hourly
-from backend.core.io_ws100 import clean_ws100_sensor, aggregate_ws100_hourly
+from backend.core.io_ws100 import clean_ws100_sensor, aggregate_ws100_hourly, read_ws100_csv
 from backend.core.io_wind import load_wind_hourly
 from backend.core.pair_core import build_pair_hourly, add_environment_flags
 from backend.core.event_core import (
     detect_events,
     build_event_windows,
-    aggregate_environment,
-    aggregate_fractions,
+    aggregate_event_windows,
     build_rh_heatmap,
 )
-from backend.services import lht_service, ws100_service
+from backend.services.utils import cached_frame, sanitize_records
 
 DEFAULT_LHT = "Kaunisharjuntie"
 DEFAULT_WS100 = "Kotaniementie"
 
+# Hourly columns exposed by the pair-hourly preview and stream
+PAIR_HOURLY_COLUMNS = [
+    "timestamp",
+    "temp_C",
+    "rh_pct",
+    "dewpoint_C",
+    "dp_spread_C",
+    "vpd_kpa",
+    "rain_mm_hour",
+    "ptype_hour",
+    "wind_speed_kmh",
+    "wind_direction_deg",
+    "wind_gusts_kmh",
+    "surface_pressure_hpa",
+    "is_raining",
+    "leaf_wetness",
+    "wet_or_rain",
+    "dry_enough_city",
+    "dry_enough_strict",
+]
+
+# Rows sanitized per chunk when streaming (bounds the Python objects alive at once)
+STREAM_CHUNK_ROWS = 1000
+
 
 def demo_analysis() -> dict:
     """
@@ -33,6 +52,9 @@ def demo_analysis() -> dict:
     This is a placeholder for the real merged analysis (LHT + WS100 + wind + events).
     Later we will replace the internals with the real logic, but keep the same shape.
     """
+    # Only the demo endpoint needs the other services: import them on first use
+    from backend.services import lht_service, ws100_service
+
     lht_stats = lht_service.demo_summary()
     ws_stats = ws100_service.demo_summary()
 
@@ -41,43 +63,15 @@ def demo_analysis() -> dict:
         "ws100": ws_stats,
     }
     
-def _deep_clean(obj):
-    """
-    Recursively walk any nested dict/list and make it JSON-safe:
-
-    - np.floating / np.integer -> plain float / int
-    - NaN / +/-inf             -> None
-    """
-    if isinstance(obj, dict):
-        return {k: _deep_clean(v) for k, v in obj.items()}
-
-    if isinstance(obj, list):
-        return [_deep_clean(v) for v in obj]
-
-    # NumPy scalars
-    if isinstance(obj, (np.floating, np.integer)):
-        v = float(obj)
-        return v if np.isfinite(v) else None
-
-    # Plain Python float
-    if isinstance(obj, float):
-        return obj if np.isfinite(obj) else None
-
-    return obj
-
-
 def _df_to_json_records(df: pd.DataFrame) -> list[dict]:
     """
-    Convert a DataFrame to a list of JSON-safe records:
-    - replace +/-inf with NaN
-    - replace NaN with None
+    Convert a DataFrame to a list of JSON-safe records
+    (NaN / +/-inf -> None, datetimes -> ISO strings; see sanitize_records).
     """
     if df is None or df.empty:
         return []
 
-    clean = df.replace([np.inf, -np.inf], np.nan)
-    clean = clean.where(clean.notna(), None)
-    return clean.to_dict(orient="records")
+    return sanitize_records(df)
 
 
 def _safe_float_matrix(matrix) -> list[list[float | None]]:
@@ -85,63 +79,19 @@ def _safe_float_matrix(matrix) -> list[list[float | None]]:
     Convert a 2D matrix (list-of-lists or np.array) to JSON-safe floats,
     mapping NaN/inf to None.
     """
-    safe_rows: list[list[float | None]] = []
     if matrix is None:
-        return safe_rows
-
-    for row in matrix:
-        safe_row: list[float | None] = []
-        for v in list(row):
-            if v is None:
-                safe_row.append(None)
-            elif isinstance(v, (float, int)):
-                if not np.isfinite(v):
-                    safe_row.append(None)
-                else:
-                    safe_row.append(float(v))
-            else:
-                safe_row.append(None)
-        safe_rows.append(safe_row)
-    return safe_rows
-
-def _make_json_safe(obj):
-    """
-    Recursively convert a nested structure (dict/list/tuple/values)
-    into something that json.dumps(..., allow_nan=False) accepts:
-    - Replace NaN / +/-inf with None
-    - Convert pandas/NumPy scalars to plain Python types
-    - Convert Timestamps/datetimes to ISO strings
-    - Leave ints/str/bool/None as-is
-    - Convert unknown types to str(...)
-    """
-    # Floats: kill NaN/inf
-    if isinstance(obj, float):
-        return float(obj) if math.isfinite(obj) else None
-
-    # Basic types
-    if obj is None or isinstance(obj, (int, str, bool)):
-        return obj
-
-    # Pandas / numpy scalars
-    if isinstance(obj, (np.floating, np.integer)):
-        v = float(obj)
-        return v if math.isfinite(v) else None
-
-    # Timestamps / datetimes
-    if isinstance(obj, (pd.Timestamp,)):
-        return obj.isoformat()
-
-    # Mappings (dict-like)
-    if isinstance(obj, Mapping):
-        return {str(k): _make_json_safe(v) for k, v in obj.items()}
-
-    # Sequences (list/tuple) but not strings/bytes
-    if isinstance(obj, Sequence) and not isinstance(obj, (str, bytes, bytearray)):
-        return [_make_json_safe(v) for v in obj]
+        return []
 
-    # Fallback: string representation
-    return str(obj)
+    arr = np.asarray(matrix)
+    if arr.dtype.kind not in "fiub":
+        # None / non-numeric cells -> NaN, so they come out as None too
+        arr = pd.to_numeric(arr.astype(object).ravel(), errors="coerce").reshape(arr.shape)
+    arr = arr.astype(np.float64)
 
+    # One isfinite sweep, then a masked store of None on an object copy
+    out = arr.astype(object)
+    out[~np.isfinite(arr)] = None
+    return out.tolist()
 
 def compute_daily_summary(df_day: pd.DataFrame) -> dict:
     """
@@ -168,95 +118,196 @@ def compute_daily_summary(df_day: pd.DataFrame) -> dict:
             "dry_strict_hours": None,
         }
 
-    T = df_day["temp_C"]
-    RH = df_day["rh_pct"]
-    rain = df_day["rain_mm_hour"]
+    # One reduction call for the measurements; the hour flags are plain bool
+    # columns (add_environment_flags), counted straight on their buffers
+    stats = df_day[["temp_C", "rh_pct", "rain_mm_hour"]].agg(["mean", "min", "max", "sum"])
 
     return {
         "rows": int(len(df_day)),
-        "T_mean": float(T.mean()),
-        "T_min": float(T.min()),
-        "T_max": float(T.max()),
-        "RH_mean": float(RH.mean()),
-        "RH_min": float(RH.min()),
-        "RH_max": float(RH.max()),
-        "rain_total_mm": float(rain.sum()),
-        "rain_hours": int((rain > 0.0).sum()),
-        "wet_hours": int(df_day["wet_or_rain"].sum()),
-        "dry_city_hours": int(df_day["dry_enough_city"].sum()),
-        "dry_strict_hours": int(df_day["dry_enough_strict"].sum()),
+        "T_mean": float(stats.at["mean", "temp_C"]),
+        "T_min": float(stats.at["min", "temp_C"]),
+        "T_max": float(stats.at["max", "temp_C"]),
+        "RH_mean": float(stats.at["mean", "rh_pct"]),
+        "RH_min": float(stats.at["min", "rh_pct"]),
+        "RH_max": float(stats.at["max", "rh_pct"]),
+        "rain_total_mm": float(stats.at["sum", "rain_mm_hour"]),
+        "rain_hours": int(np.count_nonzero(df_day["rain_mm_hour"].to_numpy(dtype=float) > 0.0)),
+        "wet_hours": int(np.count_nonzero(df_day["wet_or_rain"].to_numpy())),
+        "dry_city_hours": int(np.count_nonzero(df_day["dry_enough_city"].to_numpy())),
+        "dry_strict_hours": int(np.count_nonzero(df_day["dry_enough_strict"].to_numpy())),
     }
     
     
 
 
-def pair_hourly_preview(
-    lht_sensor: str = DEFAULT_LHT,
-    ws100_sensor: str = DEFAULT_WS100,
-    max_hours: int = 168,
-) -> dict:
+def _pair_paths(lht_sensor: str, ws100_sensor: str) -> tuple[Path, Path]:
+    """CSV paths of one LHT + WS100 pair."""
+    return (
+        Path(LHT_DATA_DIR) / f"{lht_sensor}.csv",
+        Path(WS100_DATA_DIR) / f"df_{ws100_sensor}.csv",
+    )
+
+
+def _mtime_ns(path) -> int:
+    """File modification time for cache keys (-1 if missing, so the loader raises as usual)."""
+    try:
+        return Path(path).stat().st_mtime_ns
+    except FileNotFoundError:
+        return -1
+
+
+def _pair_versions(lht_sensor: str, ws100_sensor: str) -> tuple[int, int, int]:
+    """(LHT, WS100, wind) CSV mtimes: part of every pair cache key, so edited files are reloaded."""
+    lht_path, ws_path = _pair_paths(lht_sensor, ws100_sensor)
+    return _mtime_ns(lht_path), _mtime_ns(ws_path), _mtime_ns(WIND_DATA_PATH)
+
+
+@lru_cache(maxsize=2)
+def _wind_hourly_cached(wind_path: str, mtime_ns: int) -> pd.DataFrame:
+    """load_wind_hourly() of the single global wind station, shared by every pair."""
+    return load_wind_hourly(wind_path)
+
+
+def _lht_hourly_from_csv(csv_path: Path) -> pd.DataFrame:
+    """read_csv -> clean_lht_sensor -> aggregate_lht_hourly for one LHT file."""
+    # Timestamps are parsed by the C reader in the same pass as the numbers
+    lht_raw = pd.read_csv(csv_path, parse_dates=["Timestamp"], date_format="ISO8601")
+    return aggregate_lht_hourly(clean_lht_sensor(lht_raw))
+
+
+def _ws100_hourly_from_csv(csv_path: Path) -> pd.DataFrame:
+    """read_csv -> clean_ws100_sensor -> aggregate_ws100_hourly for one WS100 file."""
+    ws_raw = read_ws100_csv(csv_path)
+    ws_clean = clean_ws100_sensor(ws_raw, rain_col="precipitationQuantityDiff_mm")
+    return aggregate_ws100_hourly(ws_clean)
+
+
+def _cached_hourly(csv_path: Path, build) -> pd.DataFrame:
     """
-    Load real CSVs for one LHT + WS100 pair, build the merged hourly dataset
-    with environment flags, and return a lightweight JSON preview.
+    build(csv_path), cached on disk under HOURLY_CACHE_DIR so that fresh worker
+    processes skip the CSV parse + clean + aggregate step (see cached_frame).
     """
+    cache_path = HOURLY_CACHE_DIR / f"{csv_path.parent.name}_{csv_path.stem}.hourly.pkl"
+    return cached_frame(csv_path, cache_path, build)
 
-    # --- LHT ---
-    lht_path = Path(LHT_DATA_DIR) / f"{lht_sensor}.csv"
-    lht_raw = pd.read_csv(lht_path)
-    lht_clean = clean_lht_sensor(lht_raw)
-    lht_hourly = aggregate_lht_hourly(lht_clean)
 
-    # --- WS100 ---
-    ws_path = Path(WS100_DATA_DIR) / f"df_{ws100_sensor}.csv"
-    ws_raw = pd.read_csv(ws_path)
-    ws_clean = clean_ws100_sensor(ws_raw, rain_col="precipitationQuantityDiff_mm")
-    ws_hourly = aggregate_ws100_hourly(ws_clean)
+@lru_cache(maxsize=32)
+def _pair_hourly_cached(lht_sensor: str, ws100_sensor: str, versions: tuple[int, int, int]) -> pd.DataFrame:
+    """
+    Load real CSVs for one LHT + WS100 pair and build the merged hourly
+    dataset with environment flags, sorted by a datetime64 timestamp.
+
+    versions (see _pair_versions) only takes part in the cache key, so an entry
+    is rebuilt when one of the CSVs changes. The returned frame is shared
+    between requests: do not mutate it.
+    """
+    lht_path, ws_path = _pair_paths(lht_sensor, ws100_sensor)
+
+    # --- LHT / WS100 hourly aggregates (disk-cached per CSV version) ---
+    lht_hourly = _cached_hourly(lht_path, _lht_hourly_from_csv)
+    ws_hourly = _cached_hourly(ws_path, _ws100_hourly_from_csv)
 
     # --- Wind (single global station) ---
-    wind_hourly = load_wind_hourly(WIND_DATA_PATH)
+    wind_hourly = _wind_hourly_cached(str(WIND_DATA_PATH), versions[2])
 
     # --- Merge + flags ---
     pair_hourly = build_pair_hourly(lht_hourly, ws_hourly, wind_hourly)
     pair_hourly = add_environment_flags(pair_hourly)
+    # A handful of precipitation types over ~40k hours: store them as a categorical
+    pair_hourly["ptype_hour"] = pair_hourly["ptype_hour"].astype("category")
+    # build_pair_hourly already returns datetime64 timestamps in sorted order;
+    # the O(N) check only falls back to a sort if that ever changes
+    if not pair_hourly["timestamp"].is_monotonic_increasing:
+        pair_hourly = pair_hourly.sort_values("timestamp")
+    return pair_hourly
+
+
+def _load_pair_hourly(lht_sensor: str, ws100_sensor: str) -> pd.DataFrame:
+    """Cached merged hourly pair for the current file versions (see _pair_hourly_cached)."""
+    return _pair_hourly_cached(lht_sensor, ws100_sensor, _pair_versions(lht_sensor, ws100_sensor))
+
 
-    pair_hourly = pair_hourly.sort_values("timestamp")
+@lru_cache(maxsize=16)
+def _events_and_windows(
+    lht_sensor: str,
+    ws100_sensor: str,
+    pre_h: int,
+    post_h: int,
+    versions: tuple[int, int, int],
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Detect events over the full record of a pair and build their windows.
+
+    Windows come back sorted by (event_id, timestamp), so the windows of any
+    run of consecutive event ids are one contiguous block. Shared between
+    requests: do not mutate the returned frames.
+    """
+    pair_hourly = _pair_hourly_cached(lht_sensor, ws100_sensor, versions)
+    events_df = detect_events(pair_hourly)
+    windows = build_event_windows(pair_hourly, events_df, pre_h=pre_h, post_h=post_h)
+    return events_df, windows
+
+
+def pair_hourly_preview(
+    lht_sensor: str = DEFAULT_LHT,
+    ws100_sensor: str = DEFAULT_WS100,
+    max_hours: int = 168,
+) -> dict:
+    """
+    Load real CSVs for one LHT + WS100 pair, build the merged hourly dataset
+    with environment flags, and return a lightweight JSON preview.
+    """
+
+    pair_hourly = _load_pair_hourly(lht_sensor, ws100_sensor)
     if max_hours is not None:
         pair_hourly = pair_hourly.tail(max_hours)
 
     # Select columns for sample
-    cols = [
-        "timestamp",
-        "temp_C",
-        "rh_pct",
-        "dewpoint_C",
-        "dp_spread_C",
-        "vpd_kpa",
-        "rain_mm_hour",
-        "ptype_hour",
-        "wind_speed_kmh",
-        "wind_direction_deg",
-        "wind_gusts_kmh",
-        "surface_pressure_hpa",
-        "is_raining",
-        "leaf_wetness",
-        "wet_or_rain",
-        "dry_enough_city",
-        "dry_enough_strict",
-    ]
-    cols = [c for c in cols if c in pair_hourly.columns]
+    cols = [c for c in PAIR_HOURLY_COLUMNS if c in pair_hourly.columns]
+
+    return {
+        **_pair_hourly_header(lht_sensor, ws100_sensor, pair_hourly),
+        # keep the sample small so frontend can inspect structure;
+        # charts can use a separate endpoint later
+        "sample": pair_hourly[cols].tail(48).to_dict(orient="records"),
+    }
 
+
+def _pair_hourly_header(lht_sensor: str, ws100_sensor: str, pair_hourly: pd.DataFrame) -> dict:
+    """Pair ids, hour count and time range of a (sorted) pair_hourly slice."""
     return {
         "lht_sensor": lht_sensor,
         "ws100_sensor": ws100_sensor,
         "n_hours": int(len(pair_hourly)),
         "start": pair_hourly["timestamp"].min().isoformat() if not pair_hourly.empty else None,
         "end": pair_hourly["timestamp"].max().isoformat() if not pair_hourly.empty else None,
-        # keep the sample small so frontend can inspect structure;
-        # charts can use a separate endpoint later
-        "sample": pair_hourly[cols].tail(48).to_dict(orient="records"),
     }
 
 
+def pair_hourly_stream(
+    lht_sensor: str = DEFAULT_LHT,
+    ws100_sensor: str = DEFAULT_WS100,
+    max_hours: int | None = None,
+) -> tuple[dict, Iterator[list[dict]]]:
+    """
+    Full merged hourly data for one pair, for NDJSON streaming.
+
+    Returns (header, chunks): the same header fields as pair_hourly_preview,
+    and an iterator of JSON-safe record lists (STREAM_CHUNK_ROWS rows each),
+    so the caller never holds the whole record set as Python objects.
+    """
+    pair_hourly = _load_pair_hourly(lht_sensor, ws100_sensor)
+    if max_hours is not None:
+        pair_hourly = pair_hourly.tail(max_hours)
+    rows = pair_hourly[[c for c in PAIR_HOURLY_COLUMNS if c in pair_hourly.columns]]
+
+    def chunks() -> Iterator[list[dict]]:
+        for lo in range(0, len(rows), STREAM_CHUNK_ROWS):
+            yield sanitize_records(rows.iloc[lo:lo + STREAM_CHUNK_ROWS])
+
+    return _pair_hourly_header(lht_sensor, ws100_sensor, pair_hourly), chunks()
+
+
 
 def pair_daily_analysis(
     lht_sensor: str,
@@ -281,41 +332,28 @@ def pair_daily_analysis(
         }
     """
     # Load and merge all data (same as pair_hourly_preview)
-    lht_path = Path(LHT_DATA_DIR) / f"{lht_sensor}.csv"
-    lht_raw = pd.read_csv(lht_path)
-    lht_clean = clean_lht_sensor(lht_raw)
-    lht_hourly = aggregate_lht_hourly(lht_clean)
-
-    ws_path = Path(WS100_DATA_DIR) / f"df_{ws100_sensor}.csv"
-    ws_raw = pd.read_csv(ws_path)
-    ws_clean = clean_ws100_sensor(ws_raw, rain_col="precipitationQuantityDiff_mm")
-    ws_hourly = aggregate_ws100_hourly(ws_clean)
-
-    wind_hourly = load_wind_hourly(WIND_DATA_PATH)
-
-    pair_hourly = build_pair_hourly(lht_hourly, ws_hourly, wind_hourly)
-    pair_hourly = add_environment_flags(pair_hourly)
-
-    # Filter to the target date
-    pair_hourly["date_str"] = pair_hourly["timestamp"].dt.strftime("%Y-%m-%d")
-    df_day = pair_hourly[pair_hourly["date_str"] == date_str].copy()
+    pair_hourly = _load_pair_hourly(lht_sensor, ws100_sensor)
+
+    # Filter to the target date: the cached frame is sorted by timestamp, so the
+    # day is one [midnight, next midnight) slice found by binary search
+    try:
+        day_start = pd.to_datetime(date_str, format="%Y-%m-%d")
+    except ValueError:
+        # Not a YYYY-MM-DD date: nothing matches
+        df_day = pair_hourly.iloc[0:0]
+    else:
+        ts = pair_hourly["timestamp"]
+        lo = ts.searchsorted(day_start, side="left")
+        hi = ts.searchsorted(day_start + pd.Timedelta(days=1), side="left")
+        df_day = pair_hourly.iloc[lo:hi]
 
     # Compute daily summary
     summary = compute_daily_summary(df_day)
 
     # --- Make hourly records JSON-friendly ---
 
-    # 1) Drop helper column
-    df_day = df_day.drop(columns=["date_str"], errors="ignore")
-
-    # 2) Ensure timestamp is a plain ISO string
-    df_day["timestamp"] = pd.to_datetime(df_day["timestamp"]).dt.strftime(
-    "%Y-%m-%dT%H:%M:%S")
-
-    # 3) Replace NaN with None so JSON encoder doesn't choke
-    df_day = df_day.replace({np.nan: None})
-
-    # 4) (Optional but cleaner) select only the useful columns for the API
+    # Select only the useful columns for the API, then sanitize them in one
+    # frame-level pass (ISO timestamp strings, NaN -> None)
     columns = [
         "timestamp",
         "temp_C",
@@ -337,7 +375,7 @@ def pair_daily_analysis(
     # keep only columns that actually exist (defensive)
     columns = [c for c in columns if c in df_day.columns]
 
-    hourly_records = df_day[columns].to_dict(orient="records")
+    hourly_records = sanitize_records(df_day[columns])
 
     return {
         "date": date_str,
@@ -350,14 +388,6 @@ def _events_to_records(df: pd.DataFrame) -> list[dict]:
     """Convert events DataFrame to JSON-safe records."""
     if df is None or df.empty:
         return []
-    out = df.copy()
-    # Normalize timestamps to ISO strings
-    for col in ["start_ts", "end_ts"]:
-        if col in out.columns:
-            out[col] = pd.to_datetime(out[col]).dt.strftime("%Y-%m-%dT%H:%M:%S")
-    # Cast numerics to float, sanitize NaN/inf -> None
-    out = out.replace([np.inf, -np.inf], np.nan)
-    out = out.where(out.notna(), None)
     
     # Select columns if they exist
     desired_cols = [
@@ -373,8 +403,13 @@ def _events_to_records(df: pd.DataFrame) -> list[dict]:
         "drying_hours_from_end",
         "drying_hours",
     ]
-    cols = [c for c in desired_cols if c in out.columns]
-    return out[cols].to_dict(orient="records")
+    cols = [c for c in desired_cols if c in df.columns]
+    out = df[cols]
+    # Timestamps as datetime64, so sanitize_records renders them as ISO strings
+    for col in ["start_ts", "end_ts"]:
+        if col in out.columns:
+            out = out.assign(**{col: pd.to_datetime(out[col])})
+    return sanitize_records(out)
 
 
 def pair_event_aggregates(
@@ -396,44 +431,31 @@ def pair_event_aggregates(
       6. Build RH heatmap for event dates (restricted to date_str).
     """
     # --- Load & merge (same logic as pair_daily_analysis) ---
-    lht_path = Path(LHT_DATA_DIR) / f"{lht_sensor}.csv"
-    lht_raw = pd.read_csv(lht_path)
-    lht_clean = clean_lht_sensor(lht_raw)
-    lht_hourly = aggregate_lht_hourly(lht_clean)
-
-    ws_path = Path(WS100_DATA_DIR) / f"df_{ws100_sensor}.csv"
-    ws_raw = pd.read_csv(ws_path)
-    ws_clean = clean_ws100_sensor(ws_raw, rain_col="precipitationQuantityDiff_mm")
-    ws_hourly = aggregate_ws100_hourly(ws_clean)
-
-    wind_hourly = load_wind_hourly(WIND_DATA_PATH)
+    versions = _pair_versions(lht_sensor, ws100_sensor)
+    pair_hourly = _pair_hourly_cached(lht_sensor, ws100_sensor, versions)
 
-    pair_hourly = build_pair_hourly(lht_hourly, ws_hourly, wind_hourly)
-    pair_hourly = add_environment_flags(pair_hourly)
-    pair_hourly = pair_hourly.sort_values("timestamp")
-
-    # --- Detect events over full record ---
-    events_df = detect_events(pair_hourly)
+    # --- Events + windows over full record (cached per pair and window size) ---
+    events_df, all_windows = _events_and_windows(
+        lht_sensor, ws100_sensor, int(pre_h), int(post_h), versions
+    )
 
     # --- Filter events for target date ---
     date_events = events_df[events_df["start_date"] == date_str].copy()
 
-    # --- Build windows & aggregates for *this* date ---
-    windows = build_event_windows(
-        pair_hourly,
-        date_events,
-        pre_h=pre_h,
-        post_h=post_h,
-    )
+    # --- Windows & aggregates for *this* date ---
+    # Events of one date have consecutive ids, so their windows are one sorted block
+    if date_events.empty:
+        windows = all_windows.iloc[0:0]
+    else:
+        ids = all_windows["event_id"]
+        lo = ids.searchsorted(date_events["event_id"].min(), side="left")
+        hi = ids.searchsorted(date_events["event_id"].max(), side="right")
+        windows = all_windows.iloc[lo:hi]
 
     if not windows.empty:
-        env_df = aggregate_environment(windows)
-        frac_df, drying_stats = aggregate_fractions(windows)
-        
-        # Merge per-event drying times back into date_events for the response
-        # aggregate_fractions calls compute_event_drying_times internally, but we need the raw DF here too
-        from backend.core.event_core import compute_event_drying_times
-        drying_times_df = compute_event_drying_times(windows)
+        # Environment means, wet/dry fractions and per-event drying times from one
+        # shared rel_hour grouping; drying times are also merged into date_events below
+        env_df, frac_df, drying_stats, drying_times_df = aggregate_event_windows(windows)
         
         if not drying_times_df.empty:
             # Merge drying info into date_events
@@ -507,6 +529,6 @@ def pair_event_aggregates(
         "n_events_date": int(len(date_events)),
     }
 
-    # Final safety net: clean EVERYTHING before FastAPI sees it
-    return _deep_clean(result)
+    # Every part above is already JSON-safe (frames go through sanitize_records)
+    return result
 
@@ -1,22 +1,24 @@
+import numpy as np
 import pandas as pd
 from typing import Dict, Any
 from backend.core.openmeteo_fetcher import fetch_openmeteo_jyvaskyla
-from backend.core.forecast_adapter import build_forecast_with_risk, build_forecast_events_with_drying
+from backend.core.forecast_adapter import build_forecast_bundle, isoformat_series
 
-def build_city_road_forecast(forecast_days: int = 10) -> Dict[str, Any]:
+def build_city_road_forecast(
+    forecast_days: int = 10, fetch=None
+) -> Dict[str, Any]:
     """
     Fetch Open-Meteo forecast for Jyväskylä and build a structured
     road-forecast summary for a single city-level zone.
     No FastAPI endpoint here, just a pure service function.
+    fetch lets callers swap in another fetcher (e.g. the on-disk cached one).
     """
     # 1. Fetch data
-    df_forecast = fetch_openmeteo_jyvaskyla(forecast_days=forecast_days)
+    fetch = fetch or fetch_openmeteo_jyvaskyla
+    df_forecast = fetch(forecast_days=forecast_days)
     
-    # 2. Run adapter + risk
-    df_hourly = build_forecast_with_risk(df_forecast)
-    
-    # 3. Run events + drying
-    events = build_forecast_events_with_drying(df_forecast)
+    # 2-3. Run adapter + risk and events + drying (flags computed once for both)
+    df_hourly, events = build_forecast_bundle(df_forecast)
     
     # 4. Compute simple stats for next 24h and next 72h
     if df_hourly.empty:
@@ -38,39 +40,50 @@ def build_city_road_forecast(forecast_days: int = 10) -> Dict[str, Any]:
     h24 = now_ts + pd.Timedelta(hours=24)
     h72 = now_ts + pd.Timedelta(hours=72)
 
-    mask_24 = df_hourly["timestamp"] < h24
-    mask_72 = df_hourly["timestamp"] < h72
+    # Raw arrays, pulled once and shared by every statistic below
+    ts_ns = df_hourly["timestamp"].array.asi8
+    valid = ~df_hourly["timestamp"].isna().to_numpy()  # NaT compares False, like before
+    score = df_hourly["slippery_score"].to_numpy(dtype=np.int64)
+    is_high = (df_hourly["slippery_level"] == "high").to_numpy()
+
+    mask_24 = valid & (ts_ns < h24.value)
+    mask_72 = valid & (ts_ns < h72.value)
 
-    high_24 = int((df_hourly.loc[mask_24, "slippery_level"] == "high").sum())
-    high_72 = int((df_hourly.loc[mask_72, "slippery_level"] == "high").sum())
+    high_24 = int((mask_24 & is_high).sum())
+    high_72 = int((mask_72 & is_high).sum())
 
-    # Handle empty 24h window for max score (e.g. if forecast is empty or very short)
-    if mask_24.any():
-        max_score_24 = int(df_hourly.loc[mask_24, "slippery_score"].max())
-    else:
-        max_score_24 = 0
+    # Scores are >= 0, so an empty 24h window (very short forecast) gives 0
+    max_score_24 = int(score[mask_24].max(initial=0))
         
-    total_events_72 = sum(
-        1 for e in events
-        if e["start_ts"] < h72.isoformat()
-    )
+    # Compare instants, not ISO strings (the UTC offset changes at the DST switch)
+    event_starts = pd.to_datetime([e["start_ts"] for e in events], format="ISO8601", utc=True)
+    total_events_72 = int((event_starts.asi8 < h72.value).sum())
 
     # Extract contiguous high-risk periods
-    high_periods_24 = _extract_high_risk_periods(df_hourly, h24)
-    high_periods_72 = _extract_high_risk_periods(df_hourly, h72)
+    high_periods_24 = _extract_high_risk_periods(df_hourly["timestamp"], score, mask_24 & is_high)
+    high_periods_72 = _extract_high_risk_periods(df_hourly["timestamp"], score, mask_72 & is_high)
 
     # 5. Build output dict (JSON-friendly)
+    # Hourly rows: each column converted to Python values once, then zipped
+    # (the ambiguous DST hour has a NaT timestamp, which isoformat() renders as "NaT")
+    hourly = [
+        {
+            "timestamp": ts,
+            "temp_C": temp,
+            "slippery_score": score,
+            "slippery_level": level,
+        }
+        for ts, temp, score, level in zip(
+            isoformat_series(df_hourly["timestamp"]).fillna("NaT").tolist(),
+            df_hourly["temp_C"].to_numpy(dtype=np.float64).tolist(),
+            df_hourly["slippery_score"].to_numpy(dtype=np.int64).tolist(),
+            df_hourly["slippery_level"].astype(str).tolist(),
+        )
+    ]
+
     summary: Dict[str, Any] = {
         "generated_at": now_ts.isoformat(),
-        "hourly": [
-            {
-                "timestamp": row["timestamp"].isoformat(),
-                "temp_C": float(row["temp_C"]),
-                "slippery_score": int(row["slippery_score"]),
-                "slippery_level": str(row["slippery_level"]),
-            }
-            for ts, row in df_hourly.iterrows()
-        ],
+        "hourly": hourly,
         "events": events,
         "stats": {
             "high_risk_hours_24h": high_24,
@@ -85,33 +98,39 @@ def build_city_road_forecast(forecast_days: int = 10) -> Dict[str, Any]:
     return summary
 
 
-def _extract_high_risk_periods(df: pd.DataFrame, end_ts: pd.Timestamp) -> list[Dict[str, Any]]:
+def _extract_high_risk_periods(
+    timestamps: pd.Series, score: np.ndarray, high_mask: np.ndarray
+) -> list[Dict[str, Any]]:
     """
-    Look at df rows with timestamp < end_ts and slippery_level == 'high'.
+    Look at the hours selected by high_mask (inside the horizon and
+    slippery_level == 'high'; score is slippery_score as an array).
     Group contiguous hours into periods and return a list of dicts.
     """
-    mask = (df["timestamp"] < end_ts) & (df["slippery_level"] == "high")
-    high = df.loc[mask].sort_values("timestamp")
-
-    if high.empty:
+    sel = np.flatnonzero(high_mask)
+    if len(sel) == 0:
         return []
 
-    # Compute a “break” whenever the gap between consecutive timestamps is > 1 hour
-    gaps = high["timestamp"].diff() > pd.Timedelta(hours=1)
-    group_ids = gaps.cumsum()  # each contiguous block gets a group id
-
-    periods = []
-    for _, group in high.groupby(group_ids):
-        start_ts = group["timestamp"].iloc[0]
-        end_ts_period = group["timestamp"].iloc[-1]
-        duration_h = float(len(group))
-        max_score = int(group["slippery_score"].max())
+    ts = timestamps.iloc[sel]
+    ts_ns = ts.array.asi8
+    score = score[sel]
+    if not (ts_ns[1:] >= ts_ns[:-1]).all():
+        order = np.argsort(ts_ns, kind="stable")
+        ts, ts_ns, score = ts.iloc[order], ts_ns[order], score[order]
 
-        periods.append({
-            "start_ts": start_ts.isoformat(),
-            "end_ts": end_ts_period.isoformat(),
-            "duration_h": duration_h,
-            "max_score": max_score,
-        })
+    # Run-length pass on raw arrays: a new period starts wherever the gap
+    # between consecutive timestamps is > 1 hour
+    starts = np.flatnonzero(np.r_[True, np.diff(ts_ns) > pd.Timedelta(hours=1).value])
+    ends = np.r_[starts[1:], len(ts_ns)] - 1
+    lengths = ends - starts + 1
+    max_scores = np.maximum.reduceat(score, starts)
 
-    return periods
+    # Only one Timestamp per period boundary is boxed for isoformat()
+    return [
+        {
+            "start_ts": ts.iloc[s].isoformat(),
+            "end_ts": ts.iloc[e].isoformat(),
+            "duration_h": float(n),
+            "max_score": int(m),
+        }
+        for s, e, n, m in zip(starts.tolist(), ends.tolist(), lengths.tolist(), max_scores.tolist())
+    ]
@@ -1,46 +1,132 @@
 # backend/services/utils.py
-import math
-from typing import Any
+import hashlib
+import inspect
+import logging
+import os
+import pickle
+from pathlib import Path
 
 import numpy as np
 import pandas as pd
 
+logger = logging.getLogger(__name__)
 
-def sanitize_for_json(obj: Any) -> Any:
+# Part of every cached_frame file name. Bump it when a cached frame changes in a
+# way the build fingerprint cannot see (e.g. a helper called by build changes).
+CACHE_FORMAT_VERSION = 1
+
+# What a missing, truncated or incompatible pickle can raise on load
+_CACHE_READ_ERRORS = (
+    OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, TypeError, ValueError,
+)
+
+
+def _json_column(col: pd.Series) -> np.ndarray:
     """
-    Recursively convert NaN / +/-inf to None so FastAPI JSONResponse
-    can serialize the payload.
-    Works for dicts, lists, pandas Series/DataFrames, numpy scalars/arrays.
+    JSON-safe object array of one column's values:
+    - float columns: NaN and +/-inf -> None through one isfinite mask
+    - int / bool columns as they are (cannot be missing or infinite)
+    - naive datetime columns -> "YYYY-MM-DDTHH:MM:SS" strings, NaT -> None
+    - anything else: +/-inf and missing markers -> None
+    """
+    dtype = col.dtype
+    if pd.api.types.is_datetime64_dtype(dtype):
+        # NumPy's C ISO formatter at second precision gives "YYYY-MM-DDTHH:MM:SS"
+        # (same as strftime("%Y-%m-%dT%H:%M:%S"), without a Python call per value)
+        ts = col.to_numpy(dtype="datetime64[s]")
+        return np.where(np.isnat(ts), None, np.datetime_as_string(ts, unit="s").astype(object))
+    if isinstance(dtype, np.dtype) and dtype.kind == "f":
+        x = col.to_numpy()
+        out = x.astype(object)
+        out[~np.isfinite(x)] = None
+        return out
+    if isinstance(dtype, np.dtype) and dtype.kind in "iub":
+        return col.to_numpy().astype(object)
+    # A categorical can only hold inf if it is one of its categories
+    if not (
+        isinstance(dtype, pd.CategoricalDtype)
+        and not dtype.categories.isin([np.inf, -np.inf]).any()
+    ):
+        col = col.replace([np.inf, -np.inf], np.nan)
+    cells = col.to_numpy(dtype=object)
+    return np.where(pd.isna(cells), None, cells)
+
+
+def _json_values(df: pd.DataFrame) -> np.ndarray:
+    """2D object array of JSON-safe cell values, filled one column at a time (see _json_column)."""
+    values = np.empty(df.shape, dtype=object)
+    for j, (_, col) in enumerate(df.items()):
+        values[:, j] = _json_column(col)
+    return values
+
+
+def sanitize_records(df: pd.DataFrame) -> list[dict]:
+    """df.to_dict(orient="records") with JSON-safe values, without an intermediate frame."""
+    columns = list(df.columns)
+    return [dict(zip(columns, row)) for row in _json_values(df).tolist()]
+
+
+def cached_frame(source_path: Path, cache_path: Path, build, key=None) -> pd.DataFrame:
     """
-    # pandas objects
-    if isinstance(obj, pd.DataFrame):
-        clean_df = obj.replace([np.inf, -np.inf], np.nan)
-        clean_df = clean_df.where(pd.notnull(clean_df), None)
-        return clean_df.to_dict(orient="list")
-
-    if isinstance(obj, pd.Series):
-        clean_s = obj.replace([np.inf, -np.inf], np.nan)
-        clean_s = clean_s.where(pd.notnull(clean_s), None)
-        return clean_s.tolist()
-
-    # numpy scalars / arrays
-    if isinstance(obj, (np.floating, np.integer)):
-        v = float(obj)
-        return v if math.isfinite(v) else None
-
-    if isinstance(obj, np.ndarray):
-        return [sanitize_for_json(x) for x in obj.tolist()]
-
-    # plain Python float
-    if isinstance(obj, float):
-        return obj if math.isfinite(obj) else None
-
-    # containers
-    if isinstance(obj, dict):
-        return {k: sanitize_for_json(v) for k, v in obj.items()}
-
-    if isinstance(obj, (list, tuple)):
-        return [sanitize_for_json(v) for v in obj]
-
-    # everything else (str, bool, None, int, etc.)
-    return obj
+    build(source_path), pickled next to cache_path so that fresh worker processes
+    skip the CSV parse (and whatever build does after it).
+
+    The file name gets a fingerprint of CACHE_FORMAT_VERSION, the pandas version,
+    build's name and source and `key` (e.g. the parsed columns), so a cache written
+    by other code is never loaded. It is used only if it is at least as new as
+    source_path. Any problem with the cache (unreadable, stale pickle, read-only
+    disk) falls back to building from the source file.
+    """
+    cache_path = cache_path.with_name(
+        f"{cache_path.stem}.{_build_fingerprint(build, key)}{cache_path.suffix}"
+    )
+    try:
+        fresh = cache_path.stat().st_mtime_ns >= source_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        fresh = False
+    except OSError as exc:
+        logger.debug("Ignoring frame cache %s: %r", cache_path, exc)
+        fresh = False
+    if fresh:
+        df = read_cached_frame(cache_path)
+        if df is not None:
+            return df
+
+    df = build(source_path)
+    write_cached_frame(cache_path, df)
+    return df
+
+
+def read_cached_frame(cache_path: Path) -> pd.DataFrame | None:
+    """Frame pickled at cache_path, or None if it is missing or cannot be loaded."""
+    try:
+        return pd.read_pickle(cache_path)
+    except FileNotFoundError:
+        return None
+    except _CACHE_READ_ERRORS as exc:
+        logger.debug("Ignoring frame cache %s: %r", cache_path, exc)
+        return None
+
+
+def write_cached_frame(cache_path: Path, df: pd.DataFrame) -> None:
+    """Pickle df at cache_path; a failed write (e.g. read-only disk) only skips caching."""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file and rename, so other workers never read a partial file
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, cache_path)
+    except OSError as exc:
+        logger.debug("Could not write frame cache %s: %r", cache_path, exc)
+
+
+def _build_fingerprint(build, key) -> str:
+    """Short hex digest of everything that decides what a cached_frame file holds."""
+    name = f"{getattr(build, '__module__', '')}.{getattr(build, '__qualname__', repr(build))}"
+    try:
+        source = inspect.getsource(build)
+    except (OSError, TypeError):
+        # No source available (builtin, functools.partial, ...): name only
+        source = ""
+    text = "\0".join([str(CACHE_FORMAT_VERSION), pd.__version__, name, source, repr(key)])
+    return hashlib.blake2b(text.encode(), digest_size=6).hexdigest()
@@ -1,146 +1,25 @@
+from functools import lru_cache
 from pathlib import Path
 import pandas as pd
 import numpy as np
 
-from backend.config import WS100_DATA_DIR
-from backend.core.io_ws100 import clean_ws100_sensor, aggregate_ws100_hourly, bucket_precip_type
+from backend.config import WS100_DATA_DIR, SENSOR_CACHE_DIR
+from backend.core.io_ws100 import (
+    clean_ws100_sensor,
+    aggregate_ws100_hourly,
+    bucket_precip_types,
+    read_ws100_csv,
+)
+from backend.services.utils import cached_frame
 
 
-def prepare_dynamic_data(df_raw: pd.DataFrame) -> pd.DataFrame:
+def _load_sensor(csv_path: Path) -> pd.DataFrame:
     """
-    Prepare WS100 data for dynamic analysis:
-    - Map precipitation types to events
-    - Calculate duration of each interval
+    read_ws100_csv(csv_path), cached on disk under SENSOR_CACHE_DIR so that
+    later loads skip the CSV tokenizer and date parsing (see cached_frame).
+    Each call returns a fresh frame.
     """
-    df = df_raw.copy()
-    
-    # Ensure sorted
-    df = df.sort_values("Timestamp")
-    
-    # Map events
-    if "precipitationType" in df.columns:
-        df["event"] = df["precipitationType"].apply(bucket_precip_type)
-    else:
-        df["event"] = "Unknown"
-        
-    # Calculate duration (time until next timestamp)
-    dt = df["Timestamp"].shift(-1) - df["Timestamp"]
-    dt_sec = dt.dt.total_seconds()
-    
-    # Fill last/invalid intervals with median positive step (usually 60s or 600s)
-    valid_steps = dt_sec[dt_sec > 0]
-    median_step = np.nanmedian(valid_steps) if len(valid_steps) > 0 else 600.0
-    
-    # Replace invalid durations (<=0 or NaN) with median
-    dt_sec = np.where((dt_sec <= 0) | np.isnan(dt_sec), median_step, dt_sec)
-    
-    df["duration_h"] = dt_sec / 3600.0
-    
-    return df
-
-
-def analyze_dynamic(
-    sensor_name: str, 
-    start_date: str, 
-    end_date: str, 
-    freq: str = "MS"
-) -> dict:
-    """
-    Dynamic analysis for WS100 dashboard.
-    """
-    csv_path = WS100_DATA_DIR / f"df_{sensor_name}.csv"
-    if not csv_path.exists():
-        raise FileNotFoundError(f"Sensor '{sensor_name}' not found")
-        
-    # Load raw data
-    raw_df = pd.read_csv(csv_path)
-    raw_df["Timestamp"] = pd.to_datetime(raw_df["Timestamp"])
-    
-    # Rename rain column for consistency with user logic
-    if "precipitationQuantityDiff_mm" in raw_df.columns:
-        raw_df["rain_mm"] = raw_df["precipitationQuantityDiff_mm"]
-    elif "Rain_mm_10min" in raw_df.columns:
-         raw_df["rain_mm"] = raw_df["Rain_mm_10min"]
-    else:
-         raw_df["rain_mm"] = 0.0
-         
-    df_prep = prepare_dynamic_data(raw_df)
-    
-    # Filter by date
-    mask = (df_prep["Timestamp"] >= pd.to_datetime(start_date)) & \
-           (df_prep["Timestamp"] <= pd.to_datetime(end_date))
-    sub = df_prep.loc[mask].copy()
-    
-    if sub.empty:
-        return {"stacked_data": [], "total_line": [], "table_data": [], "events": []}
-
-    # Aggregate
-    sub = sub.set_index("Timestamp")
-    g = pd.Grouper(freq=freq)
-    
-    # 1. Group by Period + Event
-    grouped = sub.groupby([g, "event"])[["duration_h", "rain_mm"]].sum().reset_index()
-    
-    # 2. Total per period
-    total_per_period = sub.groupby(g)[["duration_h", "rain_mm"]].sum().reset_index()
-    total_per_period = total_per_period.rename(columns={
-        "duration_h": "total_dur_h", 
-        "rain_mm": "total_rain_mm"
-    })
-    
-    # Merge
-    merged = pd.merge(grouped, total_per_period, on="Timestamp", how="left")
-    
-    merged["share_pct"] = np.where(
-        merged["total_dur_h"] > 0,
-        100 * merged["duration_h"] / merged["total_dur_h"],
-        0.0
-    )
-    
-    # Rounding
-    merged["duration_h"] = merged["duration_h"].round(1)
-    merged["rain_mm"] = merged["rain_mm"].round(1)
-    merged["share_pct"] = merged["share_pct"].round(1)
-    
-    # Format for frontend
-    stacked_data = []
-    for _, row in merged.iterrows():
-        stacked_data.append({
-            "period": row["Timestamp"].strftime("%Y-%m-%d"),
-            "event": row["event"],
-            "duration": row["duration_h"],
-            "precip": row["rain_mm"],
-            "share": row["share_pct"]
-        })
-        
-    total_line = []
-    for _, row in total_per_period.iterrows():
-        total_line.append({
-            "period": row["Timestamp"].strftime("%Y-%m-%d"),
-            "total_mm": round(row["total_rain_mm"], 1)
-        })
-        
-    events = sorted(merged["event"].unique())
-    
-    table_rows = []
-    for period, group in merged.groupby("Timestamp"):
-        row_obj = {"period": period.strftime("%Y-%m-%d")}
-        for e in events:
-            row_obj[f"{e}_dur"] = 0.0
-            row_obj[f"{e}_mm"] = 0.0
-        for _, r in group.iterrows():
-            evt = r["event"]
-            row_obj[f"{evt}_dur"] = r["duration_h"]
-            row_obj[f"{evt}_mm"] = r["rain_mm"]
-        table_rows.append(row_obj)
-        
-    return {
-        "stacked_data": stacked_data,
-        "total_line": total_line,
-        "table_data": table_rows,
-        "events": events
-    }
-
+    return cached_frame(csv_path, SENSOR_CACHE_DIR / f"ws100_{csv_path.stem}.pkl", read_ws100_csv)
 
 
 def prepare_dynamic_data(df_raw: pd.DataFrame) -> pd.DataFrame:
@@ -151,25 +30,39 @@ def prepare_dynamic_data(df_raw: pd.DataFrame) -> pd.DataFrame:
     """
     df = df_raw.copy()
     
-    # Ensure sorted
-    df = df.sort_values("Timestamp")
+    # Ensure sorted (the CSVs are stored in time order: the O(N) check
+    # usually skips the sort)
+    if not df["Timestamp"].is_monotonic_increasing:
+        df = df.sort_values("Timestamp", kind="stable")
     
     # Map events
     if "precipitationType" in df.columns:
-        df["event"] = df["precipitationType"].apply(bucket_precip_type)
+        # Lookup-table mapping over the whole column (no Python call per row)
+        df["event"] = bucket_precip_types(df["precipitationType"])
     else:
         df["event"] = "Unknown"
+    # A handful of event labels over the whole record: integer codes make the
+    # groupby in analyze_dynamic hash ints instead of strings
+    df["event"] = df["event"].astype("category")
         
-    # Calculate duration (time until next timestamp)
-    dt = df["Timestamp"].shift(-1) - df["Timestamp"]
-    dt_sec = dt.dt.total_seconds()
+    # Calculate duration (time until next timestamp) on raw int64 nanoseconds;
+    # the last row and steps from/to a NaT timestamp have none (NaN, filled below)
+    ts = df["Timestamp"].to_numpy(dtype="datetime64[ns]")
+    ts_ns = ts.view("i8")
+    dt_sec = np.full(len(ts_ns), np.nan)
+    dt_sec[:-1] = (ts_ns[1:] - ts_ns[:-1]) / 1e9
+    missing = np.isnat(ts)
+    dt_sec[:-1][missing[1:] | missing[:-1]] = np.nan
     
     # Fill last/invalid intervals with median positive step (usually 60s or 600s)
-    valid_steps = dt_sec[dt_sec > 0]
-    median_step = np.nanmedian(valid_steps) if len(valid_steps) > 0 else 600.0
+    # (NaN > 0 is False, so one mask covers both invalid cases and valid_steps
+    # has no NaN: plain np.median, one O(N) selection)
+    positive = dt_sec > 0
+    valid_steps = dt_sec[positive]
+    median_step = np.median(valid_steps) if len(valid_steps) > 0 else 600.0
     
-    # Replace invalid durations (<=0 or NaN) with median
-    dt_sec = np.where((dt_sec <= 0) | np.isnan(dt_sec), median_step, dt_sec)
+    # Replace invalid durations (<=0 or NaN) with median, in place
+    np.putmask(dt_sec, ~positive, median_step)
     
     df["duration_h"] = dt_sec / 3600.0
     
@@ -199,18 +92,33 @@ def analyze_dynamic(
         
     Returns:
         Dict with keys: stacked_data, total_line, table_data
+
+    Results are cached per CSV version; the returned dict is shared between
+    calls: do not mutate it.
     """
     csv_path = WS100_DATA_DIR / f"df_{sensor_name}.csv"
     if not csv_path.exists():
         raise FileNotFoundError(f"Sensor '{sensor_name}' not found")
-        
+
+    return _analyze_dynamic_cached(sensor_name, start_date, end_date, freq, csv_path.stat().st_mtime_ns)
+
+
+@lru_cache(maxsize=64)
+def _analyze_dynamic_cached(
+    sensor_name: str,
+    start_date: str,
+    end_date: str,
+    freq: str,
+    mtime_ns: int,
+) -> dict:
+    """analyze_dynamic body; mtime_ns only takes part in the cache key, so an edited CSV is reloaded."""
+    csv_path = WS100_DATA_DIR / f"df_{sensor_name}.csv"
+
     # Load raw data
-    raw_df = pd.read_csv(csv_path)
-    raw_df["Timestamp"] = pd.to_datetime(raw_df["Timestamp"])
+    raw_df = _load_sensor(csv_path)
     
-    # Filter by date range first to speed up if needed, but 'prepare' needs next timestamp 
-    # so better to prepare then filter, or filter with buffer. 
-    # Let's prepare all then filter.
+    # Prepare the full record, then filter: durations need the next timestamp,
+    # and invalid intervals are filled with the median step of the whole sensor
     
     # Rename rain column for consistency with user logic
     if "precipitationQuantityDiff_mm" in raw_df.columns:
@@ -223,9 +131,14 @@ def analyze_dynamic(
     df_prep = prepare_dynamic_data(raw_df)
     
     # Filter by date
-    mask = (df_prep["Timestamp"] >= pd.to_datetime(start_date)) & \
-           (df_prep["Timestamp"] <= pd.to_datetime(end_date))
-    sub = df_prep.loc[mask].copy()
+    ts = df_prep["Timestamp"]
+    start_ts, end_ts = pd.to_datetime(start_date), pd.to_datetime(end_date)
+    if ts.is_monotonic_increasing:
+        # prepare_dynamic_data sorted the rows: two binary searches give the window
+        sub = df_prep.iloc[ts.searchsorted(start_ts, "left"):ts.searchsorted(end_ts, "right")]
+    else:
+        # NaT timestamps (sorted last) break the ordering: fall back to a mask
+        sub = df_prep.loc[(ts >= start_ts) & (ts <= end_ts)]
     
     if sub.empty:
         return {"stacked_data": [], "total_line": [], "table_data": []}
@@ -236,18 +149,25 @@ def analyze_dynamic(
     
     # 1. Group by Period + Event
     # Sum duration and rain
-    grouped = sub.groupby([g, "event"])[["duration_h", "rain_mm"]].sum().reset_index()
-    
-    # 2. Total per period (for line chart and share calc)
-    total_per_period = sub.groupby(g)[["duration_h", "rain_mm"]].sum().reset_index()
+    # observed=True: only (period, event) pairs that occur, as with string labels
+    grouped = sub.groupby([g, "event"], observed=True)[["duration_h", "rain_mm"]].sum().reset_index()
+    
+    # 2. Totals per period from the per-event sums (a few rows per period),
+    # broadcast back onto each (period, event) row for the share calc
+    by_period = grouped.groupby("Timestamp")
+    merged = grouped.assign(
+        total_dur_h=by_period["duration_h"].transform("sum"),
+        total_rain_mm=by_period["rain_mm"].transform("sum"),
+    )
+
+    # Line chart totals: re-binning the period labels with the same frequency
+    # also yields the empty periods (0.0) that the chart expects
+    total_per_period = grouped.groupby(pd.Grouper(key="Timestamp", freq=freq))[["duration_h", "rain_mm"]].sum().reset_index()
     total_per_period = total_per_period.rename(columns={
         "duration_h": "total_dur_h", 
         "rain_mm": "total_rain_mm"
     })
     
-    # Merge totals back to calculate share
-    merged = pd.merge(grouped, total_per_period, on="Timestamp", how="left")
-    
     merged["share_pct"] = np.where(
         merged["total_dur_h"] > 0,
         100 * merged["duration_h"] / merged["total_dur_h"],
@@ -255,53 +175,51 @@ def analyze_dynamic(
     )
     
     # Rounding
-    merged["duration_h"] = merged["duration_h"].round(1)
-    merged["rain_mm"] = merged["rain_mm"].round(1)
-    merged["share_pct"] = merged["share_pct"].round(1)
+    rounded = ["duration_h", "rain_mm", "share_pct"]
+    merged[rounded] = merged[rounded].round(1)
     
     # Format for frontend
+    # Each column is converted to Python values once and zipped into records;
+    # each distinct period of merged is formatted once and its rows pick their
+    # label through the factorize codes (no lookup into another frame)
+    row_codes, merged_periods = pd.factorize(merged["Timestamp"], sort=True)
+    merged_strs = pd.DatetimeIndex(merged_periods).strftime("%Y-%m-%d").to_numpy(dtype=object)
     # Stacked Data: list of { period, event, duration, precip, share }
-    stacked_data = []
-    for _, row in merged.iterrows():
-        stacked_data.append({
-            "period": row["Timestamp"].strftime("%Y-%m-%d"),
-            "event": row["event"],
-            "duration": row["duration_h"],
-            "precip": row["rain_mm"],
-            "share": row["share_pct"]
-        })
-        
+    stacked_data = [
+        {"period": period, "event": event, "duration": dur, "precip": precip, "share": share}
+        for period, event, dur, precip, share in zip(
+            merged_strs[row_codes].tolist(),
+            merged["event"].tolist(),
+            merged["duration_h"].tolist(),
+            merged["rain_mm"].tolist(),
+            merged["share_pct"].tolist(),
+        )
+    ]
+
     # Total Line Data: list of { period, total_mm }
-    total_line = []
-    for _, row in total_per_period.iterrows():
-        total_line.append({
-            "period": row["Timestamp"].strftime("%Y-%m-%d"),
-            "total_mm": round(row["total_rain_mm"], 1)
-        })
-        
-    # Table Data: Pivot
-    # We want rows as periods, columns as Event_Metric
-    # But frontend might prefer a list of objects where keys are dynamic.
-    # Let's construct a list of dicts: { period: "2023-01-01", "Rain_dur": 10, "Rain_mm": 5, ... }
-    
-    # Get all unique events
+    # (Python round() on the plain floats, as before)
+    total_line = [
+        {"period": period, "total_mm": round(total, 1)}
+        for period, total in zip(
+            total_per_period["Timestamp"].dt.strftime("%Y-%m-%d").tolist(),
+            total_per_period["total_rain_mm"].tolist(),
+        )
+    ]
+
+    # Table Data: one row per period, { period: "2023-01-01", "Rain_dur": 10, "Rain_mm": 5, ... }
+    # merged has one row per (period, event): its values are scattered into a
+    # zero matrix by integer (period, event) codes, so events missing from a
+    # period stay 0.0; columns alternate <event>_dur, <event>_mm
     events = sorted(merged["event"].unique())
-    
-    table_rows = []
-    for period, group in merged.groupby("Timestamp"):
-        row_obj = {"period": period.strftime("%Y-%m-%d")}
-        
-        # Initialize all to 0
-        for e in events:
-            row_obj[f"{e}_dur"] = 0.0
-            row_obj[f"{e}_mm"] = 0.0
-            
-        for _, r in group.iterrows():
-            evt = r["event"]
-            row_obj[f"{evt}_dur"] = r["duration_h"]
-            row_obj[f"{evt}_mm"] = r["rain_mm"]
-            
-        table_rows.append(row_obj)
+    event_codes = pd.Index(events).get_indexer(merged["event"])
+    table_values = np.zeros((len(merged_strs), 2 * len(events)))
+    table_values[row_codes, 2 * event_codes] = merged["duration_h"].to_numpy()
+    table_values[row_codes, 2 * event_codes + 1] = merged["rain_mm"].to_numpy()
+    keys = ["period"] + [key for e in events for key in (f"{e}_dur", f"{e}_mm")]
+    table_rows = [
+        dict(zip(keys, [period, *values]))
+        for period, values in zip(merged_strs.tolist(), table_values.tolist())
+    ]
         
     return {
         "stacked_data": stacked_data,
@@ -311,7 +229,6 @@ def analyze_dynamic(
     }
 
 
-
 def demo_summary() -> dict:
     """
     Build a small synthetic WS100 rain dataset, run it through the
@@ -324,10 +241,13 @@ def demo_summary() -> dict:
     timestamps = pd.date_range("2023-07-01 00:00:00", periods=24 * 6, freq="10min")
 
     # Synthetic rain: a dry period, then a few hours of rain, then dry again
-    rain = np.zeros(len(timestamps))
-    # Let it rain between 06:00–09:00 and 18:00–20:00
-    rain[(timestamps.hour >= 6) & (timestamps.hour < 9)] = 0.8  # 0.8 mm / 10 min
-    rain[(timestamps.hour >= 18) & (timestamps.hour < 20)] = 0.4
+    # Let it rain between 06:00–09:00 (0.8 mm / 10 min) and 18:00–20:00 (0.4 mm / 10 min)
+    hours = timestamps.hour.to_numpy()
+    rain = np.select(
+        [(hours >= 6) & (hours < 9), (hours >= 18) & (hours < 20)],
+        [0.8, 0.4],
+        default=0.0,
+    )
 
     raw_df = pd.DataFrame(
         {
@@ -360,14 +280,21 @@ def list_sensors() -> list[str]:
     Returns:
         List of sensor names, e.g. ['Kaakkovuorentie', 'Kotaniementie', 'Saaritie', ...]
     """
-    if not WS100_DATA_DIR.exists():
+    try:
+        dir_mtime_ns = WS100_DATA_DIR.stat().st_mtime_ns
+    except FileNotFoundError:
         return []
-    
+
+    # The directory mtime changes whenever a file is added, removed or renamed,
+    # so one stat() replaces the directory scan on a warm cache
+    return list(_list_sensors_cached(dir_mtime_ns))
+
+
+@lru_cache(maxsize=1)
+def _list_sensors_cached(dir_mtime_ns: int) -> tuple[str, ...]:
     csv_files = sorted(WS100_DATA_DIR.glob("df_*.csv"))
     # Remove 'df_' prefix and '.csv' suffix
-    sensor_names = [f.stem.replace("df_", "") for f in csv_files]
-    
-    return sensor_names
+    return tuple(f.stem.replace("df_", "") for f in csv_files)
 
 
 def sensor_summary(sensor_name: str) -> dict:
@@ -382,6 +309,9 @@ def sensor_summary(sensor_name: str) -> dict:
     
     Raises:
         FileNotFoundError: If the sensor CSV file does not exist
+
+    Results are cached per CSV version; the returned dict is shared between
+    calls: do not mutate it.
     """
     csv_path = WS100_DATA_DIR / f"df_{sensor_name}.csv"
     
@@ -390,121 +320,17 @@ def sensor_summary(sensor_name: str) -> dict:
         raise FileNotFoundError(
             f"Sensor '{sensor_name}' not found. Available sensors: {available}"
         )
-    
-    # Load the CSV
-    raw_df = pd.read_csv(csv_path)
-    
-    # The WS100 CSVs have columns: Timestamp, precipitationIntensity_mm_h, 
-    # precipitationIntensity_mm_min, precipitationQuantityAbs_mm, 
-    # precipitationQuantityDiff_mm, precipitationType
-    # We'll use precipitationQuantityDiff_mm as the rain accumulation per interval
-    
-    # Prepare for cleaning pipeline
-    df_for_cleaning = raw_df[["Timestamp", "precipitationQuantityDiff_mm"]].copy()
-    df_for_cleaning = df_for_cleaning.rename(
-        columns={"precipitationQuantityDiff_mm": "Rain_mm_10min"}
-    )
-    
-    # Clean and aggregate
-    df_clean = clean_ws100_sensor(df_for_cleaning)
-    hourly = aggregate_ws100_hourly(df_clean)
-    
-    # Compute statistics
-    total_rain = float(df_clean["Rain_mm"].sum())
-    max_hourly = float(hourly["Rain_mm_hour"].max())
-    rain_hours = int((hourly["Rain_mm_hour"] > 0).sum())
-    
-    # Additional statistics
-    mean_hourly = float(hourly["Rain_mm_hour"].mean())
-from pathlib import Path
-import pandas as pd
-import numpy as np
-
-from backend.config import WS100_DATA_DIR
-from backend.core.io_ws100 import clean_ws100_sensor, aggregate_ws100_hourly
-
-
-def demo_summary() -> dict:
-    """
-    Build a small synthetic WS100 rain dataset, run it through the
-    WS100 preprocessing pipeline, and return simple summary stats.
-
-    This is only for testing the backend wiring. Later we will
-    replace the synthetic data with real CSV loading.
-    """
-    # Create a simple 10-min synthetic time series for 24 hours
-    timestamps = pd.date_range("2023-07-01 00:00:00", periods=24 * 6, freq="10min")
-
-    # Synthetic rain: a dry period, then a few hours of rain, then dry again
-    rain = np.zeros(len(timestamps))
-    # Let it rain between 06:00–09:00 and 18:00–20:00
-    rain[(timestamps.hour >= 6) & (timestamps.hour < 9)] = 0.8  # 0.8 mm / 10 min
-    rain[(timestamps.hour >= 18) & (timestamps.hour < 20)] = 0.4
-
-    raw_df = pd.DataFrame(
-        {
-            "Timestamp": timestamps,
-            "Rain_mm_10min": rain,
-        }
-    )
 
-    df_clean = clean_ws100_sensor(raw_df)
-    hourly = aggregate_ws100_hourly(df_clean)
+    return _sensor_summary_cached(sensor_name, csv_path.stat().st_mtime_ns)
 
-    total_rain = float(df_clean["Rain_mm"].sum())
-    max_hourly = float(hourly["Rain_mm_hour"].max())
-    rain_hours = int((hourly["Rain_mm_hour"] > 0).sum())
 
-    return {
-        "rows_raw": int(len(raw_df)),
-        "rows_clean": int(len(df_clean)),
-        "rows_hourly": int(len(hourly)),
-        "rain_total_mm": total_rain,
-        "rain_max_hour_mm": max_hourly,
-        "rain_hours": rain_hours,
-    }
-
-
-def list_sensors() -> list[str]:
-    """
-    List all available WS100 sensor CSV files (without df_ prefix and .csv extension).
-    
-    Returns:
-        List of sensor names, e.g. ['Kaakkovuorentie', 'Kotaniementie', 'Saaritie', ...]
-    """
-    if not WS100_DATA_DIR.exists():
-        return []
-    
-    csv_files = sorted(WS100_DATA_DIR.glob("df_*.csv"))
-    # Remove 'df_' prefix and '.csv' suffix
-    sensor_names = [f.stem.replace("df_", "") for f in csv_files]
-    
-    return sensor_names
-
-
-def sensor_summary(sensor_name: str) -> dict:
-    """
-    Load a real WS100 sensor CSV and compute summary statistics.
-    
-    Args:
-        sensor_name: Name of the sensor (e.g., 'Saaritie', 'Kaakkovuorentie')
-    
-    Returns:
-        Dictionary with summary statistics
-    
-    Raises:
-        FileNotFoundError: If the sensor CSV file does not exist
-    """
+@lru_cache(maxsize=16)
+def _sensor_summary_cached(sensor_name: str, mtime_ns: int) -> dict:
+    """sensor_summary body; mtime_ns only takes part in the cache key, so an edited CSV is reloaded."""
     csv_path = WS100_DATA_DIR / f"df_{sensor_name}.csv"
-    
-    if not csv_path.exists():
-        available = list_sensors()
-        raise FileNotFoundError(
-            f"Sensor '{sensor_name}' not found. Available sensors: {available}"
-        )
-    
+
     # Load the CSV
-    raw_df = pd.read_csv(csv_path)
+    raw_df = _load_sensor(csv_path)
     
     # The WS100 CSVs have columns: Timestamp, precipitationIntensity_mm_h, 
     # precipitationIntensity_mm_min, precipitationQuantityAbs_mm, 
@@ -559,7 +385,7 @@ def get_sensor_data(sensor_name: str) -> dict:
     if not csv_path.exists():
         raise FileNotFoundError(f"Sensor '{sensor_name}' not found")
     
-    raw_df = pd.read_csv(csv_path)
+    raw_df = _load_sensor(csv_path)
     
     # Prepare for cleaning pipeline
     df_for_cleaning = raw_df[["Timestamp", "precipitationQuantityDiff_mm"]].copy()
@@ -0,0 +1,82 @@
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import pandas as pd
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+from backend.config import LHT_DATA_DIR, WS100_DATA_DIR, WIND_DATA_PATH, SENSOR_CACHE_DIR
+from backend.core.io_lht import clean_lht_sensor, aggregate_lht_hourly
+from backend.core.io_ws100 import clean_ws100_sensor, aggregate_ws100_hourly, read_ws100_csv
+from backend.core.io_wind import load_wind_hourly
+from backend.core.pair_core import build_pair_hourly, add_environment_flags
+from backend.core.event_core import detect_events
+from backend.services.pair_service import DEFAULT_LHT, DEFAULT_WS100
+from backend.services.utils import cached_frame
+
+def _read_lht_csv(path_csv):
+    return pd.read_csv(
+        path_csv,
+        usecols=["Timestamp", "Temperature_C", "Humidity"],
+        parse_dates=["Timestamp"],
+        date_format="ISO8601",
+    )
+
+def _read_sensor(path_csv, read):
+    # Parsed CSV, pickled after the first read (rebuilt when the CSV changes)
+    return cached_frame(path_csv, SENSOR_CACHE_DIR / f"parsed_{path_csv.stem}.pkl", read)
+
+def load_full_pair():
+    # Load & merge (same logic as pair_daily_analysis)
+    lht_path = Path(LHT_DATA_DIR) / f"{DEFAULT_LHT}.csv"
+    if not lht_path.exists():
+        pytest.skip("LHT data not found")
+
+    ws_path = Path(WS100_DATA_DIR) / f"df_{DEFAULT_WS100}.csv"
+    if not ws_path.exists():
+        pytest.skip("WS100 data not found")
+
+    # The three reads are independent (the C parser releases the GIL)
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        lht_future = pool.submit(_read_sensor, lht_path, _read_lht_csv)
+        ws_future = pool.submit(_read_sensor, ws_path, read_ws100_csv)
+        wind_future = pool.submit(load_wind_hourly, WIND_DATA_PATH)
+
+    lht_clean = clean_lht_sensor(lht_future.result())
+    lht_hourly = aggregate_lht_hourly(lht_clean)
+
+    ws_clean = clean_ws100_sensor(ws_future.result(), rain_col="precipitationQuantityDiff_mm")
+    ws_hourly = aggregate_ws100_hourly(ws_clean)
+
+    wind_hourly = wind_future.result()
+
+    pair_hourly = build_pair_hourly(lht_hourly, ws_hourly, wind_hourly)
+    pair_hourly = add_environment_flags(pair_hourly)
+    pair_hourly = pair_hourly.sort_values("timestamp")
+    return pair_hourly
+
+# Session fixtures: the full pair table (and its events) is built once per test run
+
+@pytest.fixture(scope="session")
+def pair_hourly_full():
+    print("Loading data...")
+    try:
+        return load_full_pair()
+    except Exception as e:
+        pytest.skip(f"Error loading data: {e}")
+
+@pytest.fixture(scope="session")
+def events_old(pair_hourly_full):
+    print("Detecting events with old threshold (0.02)...")
+    return detect_events(pair_hourly_full, rain_threshold=0.02)
+
+# Not derived from events_old by filtering on peak rain: hours with a precipitation
+# type join an event whatever the amount, so a higher threshold changes event
+# boundaries (and ids), not just which events are kept
+@pytest.fixture(scope="session")
+def events_new(pair_hourly_full):
+    print("Detecting events with new threshold (0.2)...")
+    return detect_events(pair_hourly_full, rain_threshold=0.2)
@@ -8,7 +8,7 @@ sys.path.append(os.getcwd())
 
 from backend.config import LHT_DATA_DIR, WS100_DATA_DIR, WIND_DATA_PATH
 from backend.core.io_lht import clean_lht_sensor, aggregate_lht_hourly
-from backend.core.io_ws100 import clean_ws100_sensor, aggregate_ws100_hourly
+from backend.core.io_ws100 import clean_ws100_sensor, aggregate_ws100_hourly, read_ws100_csv
 from backend.core.io_wind import load_wind_hourly
 from backend.core.pair_core import build_pair_hourly, add_environment_flags
 from backend.core.event_core import detect_events, build_event_windows
@@ -25,7 +25,7 @@ def debug_event_drying():
     lht_hourly = aggregate_lht_hourly(lht_clean)
 
     ws_path = Path(WS100_DATA_DIR) / f"df_{DEFAULT_WS100}.csv"
-    ws_raw = pd.read_csv(ws_path)
+    ws_raw = read_ws100_csv(ws_path)
     ws_clean = clean_ws100_sensor(ws_raw, rain_col="precipitationQuantityDiff_mm")
     ws_hourly = aggregate_ws100_hourly(ws_clean)
 
@@ -34,7 +34,9 @@ def debug_event_drying():
     # 2. Build Pair
     pair_hourly = build_pair_hourly(lht_hourly, ws_hourly, wind_hourly)
     pair_hourly = add_environment_flags(pair_hourly)
-    pair_hourly = pair_hourly.sort_values("timestamp")
+    # build_pair_hourly returns rows in time order; only sort if that ever changes
+    if not pair_hourly["timestamp"].is_monotonic_increasing:
+        pair_hourly = pair_hourly.sort_values("timestamp", kind="stable")
 
     # 3. Detect Events
     events_df = detect_events(pair_hourly)
@@ -47,26 +49,35 @@ def debug_event_drying():
         print(f"No events found starting on {target_date}")
         return
 
+    # Event bounds parsed once; pair_hourly is sorted by timestamp, so every
+    # time window below is an iloc slice between two binary searches
+    date_events["start_ts"] = pd.to_datetime(date_events["start_ts"])
+    date_events["end_ts"] = pd.to_datetime(date_events["end_ts"])
+    timestamps = pair_hourly["timestamp"]
+
+    def hours_between(start, end):
+        lo = timestamps.searchsorted(start, side="left")
+        hi = timestamps.searchsorted(end, side="right")
+        return pair_hourly.iloc[lo:hi]
+
     # 5. Print Event List
     print(f"\nEvents starting on {target_date}:")
     print(f"{'event_id':<10} {'start':<20} {'end':<20} {'duration_h':<10} {'mm_total':<10} {'ptype_main':<10}")
     
-    for _, ev in date_events.iterrows():
-        start_ts = pd.to_datetime(ev["start_ts"])
-        end_ts = pd.to_datetime(ev["end_ts"])
+    # Plain tuples per row (itertuples) instead of a boxed Series per row (iterrows)
+    for event_id, start_ts, end_ts in date_events[["event_id", "start_ts", "end_ts"]].itertuples(index=False, name=None):
         duration_h = (end_ts - start_ts).total_seconds() / 3600
         
         # Calculate total rain and main ptype for the event
         # We need to look at the pair_hourly data for this event's duration
-        mask = (pair_hourly["timestamp"] >= start_ts) & (pair_hourly["timestamp"] <= end_ts)
-        event_data = pair_hourly[mask]
+        event_data = hours_between(start_ts, end_ts)
         mm_total = event_data["rain_mm_hour"].sum()
         
         # Simple ptype logic: most frequent ptype that is not NoData, or just "Rain" if mixed
         ptypes = event_data["ptype_hour"].unique()
         ptype_main = "Mix" if len(ptypes) > 1 else (ptypes[0] if len(ptypes) > 0 else "Unknown")
         
-        print(f"{ev['event_id']:<10} {str(start_ts):<20} {str(end_ts):<20} {duration_h:<10.1f} {mm_total:<10.2f} {ptype_main:<10}")
+        print(f"{event_id:<10} {str(start_ts):<20} {str(end_ts):<20} {duration_h:<10.1f} {mm_total:<10.2f} {ptype_main:<10}")
 
     # 6. Print Drying Record
     print(f"\nDrying Record (hours from start):")
@@ -85,20 +96,19 @@ def debug_event_drying():
 
     # 7. Detailed Table for the big storm
     # Find event starting around 06:00
-    # We iterate to find the one closest to 06:00
+    # First event whose start hour is 06:00
     target_start_hour = 6
     big_event = None
-    for _, ev in date_events.iterrows():
-        if pd.to_datetime(ev["start_ts"]).hour == target_start_hour:
-            big_event = ev
-            break
+    at_target_hour = date_events[date_events["start_ts"].dt.hour == target_start_hour]
+    if not at_target_hour.empty:
+        big_event = at_target_hour.iloc[0]
     
     if big_event is None and not date_events.empty:
         big_event = date_events.iloc[0] # Fallback
         
     if big_event is not None:
-        start_ts = pd.to_datetime(big_event["start_ts"])
-        end_ts = pd.to_datetime(big_event["end_ts"])
+        start_ts = big_event["start_ts"]
+        end_ts = big_event["end_ts"]
         print(f"\nDetailed Table for Event {big_event['event_id']} (End: {end_ts})")
         print("First 120 hours AFTER event end:")
         
@@ -106,8 +116,7 @@ def debug_event_drying():
         window_start = end_ts
         window_end = end_ts + pd.Timedelta(hours=120)
         
-        mask = (pair_hourly["timestamp"] >= window_start) & (pair_hourly["timestamp"] <= window_end)
-        detail_df = pair_hourly[mask].copy()
+        detail_df = hours_between(window_start, window_end).copy()
         
         # Limit to rows 60-120 as requested, but let's show a slice that covers the transition if possible
         # User asked: "Limit to, say, 60–120 rows so I can see how the weather evolves until dry_enough_city becomes True"
@@ -121,9 +130,10 @@ def debug_event_drying():
         slice_df = detail_df[(detail_df["hours_after_end"] >= 60) & (detail_df["hours_after_end"] <= 120)]
         
         print(f"{'timestamp':<20} {'rain':<6} {'rh':<6} {'dp_spr':<8} {'vpd':<6} {'wind':<6} {'dry_city':<10}")
-        for _, row in slice_df.iterrows():
-            ts_str = row["timestamp"].strftime("%Y-%m-%d %H:%M")
-            print(f"{ts_str:<20} {row['rain_mm_hour']:<6.2f} {row['rh_pct']:<6.1f} {row['dp_spread_C']:<8.2f} {row['vpd_kpa']:<6.2f} {row['wind_speed_kmh']:<6.1f} {str(row['dry_enough_city']):<10}")
+        detail_cols = ["timestamp", "rain_mm_hour", "rh_pct", "dp_spread_C", "vpd_kpa", "wind_speed_kmh", "dry_enough_city"]
+        for ts, rain, rh, dp_spread, vpd, wind, dry_city in slice_df[detail_cols].itertuples(index=False, name=None):
+            ts_str = ts.strftime("%Y-%m-%d %H:%M")
+            print(f"{ts_str:<20} {rain:<6.2f} {rh:<6.1f} {dp_spread:<8.2f} {vpd:<6.2f} {wind:<6.1f} {str(dry_city):<10}")
 
 if __name__ == "__main__":
     debug_event_drying()
@@ -0,0 +1,37 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+from backend.services.forecast_service import _split_current_and_window
+
+
+def _hourly_forecast(start, periods=6):
+    return pd.DataFrame({
+        "time": pd.date_range(start, periods=periods, freq="h"),
+        "temperature_2m": range(periods),
+    })
+
+
+def test_naive_forecast_times_are_localized_to_helsinki():
+    now = datetime.now(ZoneInfo("Europe/Helsinki")).replace(minute=0, second=0, microsecond=0)
+    # Naive wall-clock times starting two hours before the current Helsinki hour
+    df = _hourly_forecast(pd.Timestamp(now).tz_localize(None) - pd.Timedelta(hours=2))
+
+    current, window = _split_current_and_window(df)
+
+    assert str(window["time"].dt.tz) == "Europe/Helsinki"
+    assert current["time"] == pd.Timestamp(now)
+    assert current["temperature_2m"] == 2
+    # The caller's frame keeps its naive times
+    assert df["time"].dt.tz is None
+
+
+def test_other_timezones_are_converted_to_helsinki():
+    now = datetime.now(ZoneInfo("Europe/Helsinki")).replace(minute=0, second=0, microsecond=0)
+    df = _hourly_forecast(pd.Timestamp(now).tz_convert("UTC"))
+
+    current, window = _split_current_and_window(df)
+
+    assert str(window["time"].dt.tz) == "Europe/Helsinki"
+    assert current["time"] == pd.Timestamp(now)
+    assert str(df["time"].dt.tz) == "UTC"
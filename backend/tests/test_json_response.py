@@ -0,0 +1,16 @@
+import numpy as np
+import orjson
+from backend.app import ORJSONResponse
+
+
+def test_nan_and_ndarray_serialize_to_null_and_list():
+    content = {
+        "value": float("nan"),
+        "mean": np.float64("nan"),
+        "rh_matrix": np.array([[95.5, np.nan], [np.nan, 80.0]]),
+    }
+
+    body = ORJSONResponse(content).body
+
+    assert body == b'{"value":null,"mean":null,"rh_matrix":[[95.5,null],[null,80.0]]}'
+    assert orjson.loads(body)["rh_matrix"] == [[95.5, None], [None, 80.0]]
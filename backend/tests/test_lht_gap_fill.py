@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+from backend.core.io_lht import clean_lht_sensor
+
+
+def test_clean_lht_fills_only_short_interior_gaps():
+    ts = pd.date_range("2021-02-01 00:00", periods=14, freq="10min")
+    temp = [1.0, np.nan, np.nan, 4.0, 5.0, np.nan, np.nan, np.nan, np.nan, np.nan, np.nan, np.nan, 13.0, np.nan]
+    raw = pd.DataFrame({"Timestamp": ts, "TempC_SHT": temp, "Hum_SHT": 50.0})
+
+    out = clean_lht_sensor(raw)
+
+    expected = (
+        pd.Series(temp, index=ts)
+        .interpolate(method="time", limit=3, limit_direction="both", limit_area="inside")
+        .to_numpy()
+    )
+    np.testing.assert_allclose(out["Temperature_C"].to_numpy(), expected)
+    # Gap of 7: three filled from each side, the middle sample stays missing
+    assert np.isnan(out["Temperature_C"].iloc[8])
+    # Trailing NaN is outside the data, never extrapolated
+    assert np.isnan(out["Temperature_C"].iloc[-1])
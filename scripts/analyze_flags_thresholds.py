@@ -5,32 +5,53 @@ Analyzes pair_hourly data to understand flag behavior and thresholds.
 
 import pandas as pd
 import numpy as np
+import argparse
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
 # Add backend to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
 
 from core.pair_core import build_pair_hourly, add_environment_flags
 from core.road_risk import add_slippery_risk
-from core.event_core import detect_events, build_event_windows, compute_event_drying_times
+from core.io_ws100 import hourly_mode
+from core.event_core import detect_events, build_event_windows, compute_event_drying_times, ensure_datetime
 from core.thresholds import DEFAULT_THRESHOLDS
+from config import SENSOR_CACHE_DIR
+from services.utils import cached_frame
+
+# Columns used downstream of each load (build_pair_hourly only needs rain,
+# ptype and wind speed); the rest is never parsed
+LHT_COLUMNS = ['Timestamp', 'Temperature_C', 'Humidity']
+WS100_COLUMNS = ['Timestamp', 'precipitationIntensity_mm_h', 'precipitationType']
+WIND_COLUMNS = ['Timestamp', 'wind_speed_10m (km/h)']
+
+def _read_sensor(path_csv, columns):
+    """Sensor CSV with a parsed Timestamp column, pickled after the first parse."""
+    path_csv = Path(path_csv)
+
+    def parse(path):
+        return pd.read_csv(path, usecols=columns, parse_dates=['Timestamp'], date_format='ISO8601')
+
+    # parse's source doesn't show the columns, so they go into the cache key
+    return cached_frame(path_csv, SENSOR_CACHE_DIR / f"analysis_{path_csv.stem}.pkl", parse, key=columns)
 
 def load_historical_data():
     """Load LHT, WS100, and wind data for 2021-2024."""
     print("Loading historical sensor data...")
     
-    # Load LHT data (using Kaunisharjuntie as primary)
-    lht_df = pd.read_csv('cleaned_datasets/LHT/Kaunisharjuntie.csv')
-    lht_df['Timestamp'] = pd.to_datetime(lht_df['Timestamp'])
-    
-    # Load WS100 data (using Kotaniementie as primary)
-    ws100_df = pd.read_csv('cleaned_datasets/wes100/df_Kotaniementie.csv')
-    ws100_df['Timestamp'] = pd.to_datetime(ws100_df['Timestamp'])
-    
-    # Load wind data
-    wind_df = pd.read_csv('cleaned_datasets/cleaned_wind_data.csv')
-    wind_df['Timestamp'] = pd.to_datetime(wind_df['Timestamp'])
+    # The three files are independent and the C parser releases the GIL,
+    # so the reads overlap in a small thread pool
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        # LHT data (using Kaunisharjuntie as primary)
+        lht_future = pool.submit(_read_sensor, 'cleaned_datasets/LHT/Kaunisharjuntie.csv', LHT_COLUMNS)
+        # WS100 data (using Kotaniementie as primary)
+        ws100_future = pool.submit(_read_sensor, 'cleaned_datasets/wes100/df_Kotaniementie.csv', WS100_COLUMNS)
+        # Wind data
+        wind_future = pool.submit(_read_sensor, 'cleaned_datasets/cleaned_wind_data.csv', WIND_COLUMNS)
+    lht_df, ws100_df, wind_df = lht_future.result(), ws100_future.result(), wind_future.result()
     
     print(f"LHT data: {len(lht_df)} rows, {lht_df['Timestamp'].min()} to {lht_df['Timestamp'].max()}")
     print(f"WS100 data: {len(ws100_df)} rows, {ws100_df['Timestamp'].min()} to {ws100_df['Timestamp'].max()}")
@@ -52,16 +73,23 @@ def resample_to_hourly(lht_df, ws100_df, wind_df):
     })
     
     # Resample WS100 to hourly (sum rain, mean for others)
+    ws100_df = ws100_df.set_index('Timestamp')
     agg_dict = {'Rain_mm_hour': 'sum'}
-    if 'ptype_hour' in ws100_df.columns:
-        # For ptype, take the most common value
-        agg_dict['ptype_hour'] = lambda x: x.mode()[0] if len(x.mode()) > 0 else 0
-    
     for col in ws100_df.columns:
-        if col not in ['Timestamp', 'Rain_mm_hour', 'ptype_hour']:
+        if col not in ['Rain_mm_hour', 'ptype_hour']:
             agg_dict[col] = 'mean'
     
-    ws100_resampled = ws100_df.set_index('Timestamp').resample('h').agg(agg_dict).reset_index()
+    ws100_resampled = ws100_df.resample('h').agg(agg_dict)
+    if 'ptype_hour' in ws100_df.columns:
+        # For ptype, take the most common value (ties -> smallest code, 0 for hours
+        # without readings), counted in one pass instead of Series.mode() per hour
+        ptype_mode = hourly_mode(ws100_df['ptype_hour'])
+        # A handful of codes over every hour: stored as a categorical. Float
+        # categories, as the left join in build_pair_hourly used to give
+        # (labels stay "60.0", not "60")
+        ptype_hour = ptype_mode.reindex(ws100_resampled.index, fill_value=0).astype(float).astype('category')
+        ws100_resampled.insert(1, 'ptype_hour', ptype_hour)
+    ws100_resampled = ws100_resampled.reset_index()
     
     # Resample wind to hourly
     wind_hourly = wind_df.set_index('Timestamp').resample('h').mean().reset_index()
@@ -72,13 +100,20 @@ def resample_to_hourly(lht_df, ws100_df, wind_df):
     
     return lht_hourly, ws100_resampled, wind_hourly
 
-def analyze_flag_frequencies(pair_df):
+def save_output(df, path_csv, pickle_copy=False, index=True):
+    """Write df to path_csv; with pickle_copy also a .pkl next to it (keeps dtypes)."""
+    df.to_csv(path_csv, index=index)
+    if pickle_copy:
+        path_pkl = Path(path_csv).with_suffix('.pkl')
+        df.to_pickle(path_pkl)
+        print(f"Saved: {path_pkl}")
+
+def analyze_flag_frequencies(pair_df, pickle_copy=False):
     """Analyze how often each flag is True, broken down by month."""
     print("\n=== FLAG FREQUENCY ANALYSIS ===")
     
-    df = pair_df.copy()
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
-    df['year_month'] = df['timestamp'].dt.to_period('M')
+    # year_month is added once in main(); pair_df is only read here
+    df = pair_df
     
     # Define flags to analyze
     wetness_flags = ['is_raining', 'leaf_wetness', 'wet_or_rain']
@@ -86,19 +121,18 @@ def analyze_flag_frequencies(pair_df):
     
     all_flags = wetness_flags + drying_flags
     
-    # Overall statistics
+    # Overall statistics (mean of a bool column = fraction True), computed once
+    overall_pct = df[[flag for flag in all_flags if flag in df.columns]].mean().mul(100)
     print("\n--- Overall Flag Frequencies (% of time True) ---")
-    for flag in all_flags:
-        if flag in df.columns:
-            pct = (df[flag].sum() / len(df)) * 100
-            print(f"{flag:25s}: {pct:6.2f}%")
+    for flag, pct in overall_pct.items():
+        print(f"{flag:25s}: {pct:6.2f}%")
     
-    # Monthly breakdown
+    # Monthly breakdown (one grouped mean instead of a Python lambda per month)
     print("\n--- Monthly Breakdown ---")
-    monthly = df.groupby('year_month')[all_flags].apply(lambda x: (x.sum() / len(x)) * 100)
+    monthly = df.groupby('year_month')[all_flags].mean().mul(100)
     
     # Save to CSV
-    monthly.to_csv('flag_frequencies_monthly.csv')
+    save_output(monthly, 'flag_frequencies_monthly.csv', pickle_copy)
     print("Saved: flag_frequencies_monthly.csv")
     
     # Print summary statistics
@@ -107,55 +141,67 @@ def analyze_flag_frequencies(pair_df):
     
     # Identify rare flags (< 5% overall)
     print("\n--- Rare Flags (< 5% occurrence) ---")
-    for flag in all_flags:
-        if flag in df.columns:
-            pct = (df[flag].sum() / len(df)) * 100
-            if pct < 5.0:
-                print(f"{flag}: {pct:.2f}%")
+    for flag, pct in overall_pct.items():
+        if pct < 5.0:
+            print(f"{flag}: {pct:.2f}%")
     
     return monthly
 
-def analyze_road_risk_flags(pair_df):
+def analyze_road_risk_flags(pair_df, pickle_copy=False):
     """Analyze road risk-specific flags."""
     print("\n=== ROAD RISK FLAG ANALYSIS ===")
     
     # Add road risk scoring
+    # year_month comes from main(), hour from build_pair_hourly
     df_risk = add_slippery_risk(pair_df)
     
-    df_risk['timestamp'] = pd.to_datetime(df_risk['timestamp'])
-    df_risk['year_month'] = df_risk['timestamp'].dt.to_period('M')
-    df_risk['hour'] = df_risk['timestamp'].dt.hour
+    # Raw arrays, pulled once and shared by the statistics below
+    n_hours = len(df_risk)
+    temp = df_risk['temp_C'].to_numpy(dtype=float)
+    hour = df_risk['hour'].to_numpy()
+    score = df_risk['slippery_score'].to_numpy()
+    levels = ['low', 'medium', 'high']
+    level_codes = pd.Categorical(df_risk['slippery_level'], categories=levels).codes
     
     # Analyze freezing band
-    is_freezing_band = (df_risk['temp_C'] >= -4.0) & (df_risk['temp_C'] <= 1.0)
-    freezing_pct = (is_freezing_band.sum() / len(df_risk)) * 100
+    is_freezing_band = (temp >= -4.0) & (temp <= 1.0)
+    freezing_pct = (is_freezing_band.sum() / n_hours) * 100
     print(f"\nFreezing band (-4°C to 1°C): {freezing_pct:.2f}% of hours")
     
     # Analyze commute hours
-    is_commute = df_risk['hour'].isin([5, 6, 7, 8, 16, 17, 18, 19])
-    commute_pct = (is_commute.sum() / len(df_risk)) * 100
+    is_commute = np.isin(hour, [5, 6, 7, 8, 16, 17, 18, 19])
+    commute_pct = (is_commute.sum() / n_hours) * 100
     print(f"Commute hours (5-8, 16-19): {commute_pct:.2f}% of hours")
     
-    # Analyze slippery levels
+    # Analyze slippery levels (one bincount over the level codes; other values are -1)
     print("\n--- Slippery Risk Levels ---")
-    risk_counts = df_risk['slippery_level'].value_counts()
-    for level in ['low', 'medium', 'high']:
-        count = risk_counts.get(level, 0)
-        pct = (count / len(df_risk)) * 100
+    level_counts = np.bincount(level_codes[level_codes >= 0], minlength=len(levels))
+    for level, count in zip(levels, level_counts.tolist()):
+        pct = (count / n_hours) * 100
         print(f"{level:10s}: {pct:6.2f}% ({count:,} hours)")
     
     # High risk score distribution
-    high_scores = df_risk[df_risk['slippery_score'] >= 70]
-    print(f"\nHours with score >= 70: {len(high_scores):,} ({len(high_scores)/len(df_risk)*100:.2f}%)")
+    n_high = int((score >= 70).sum())
+    print(f"\nHours with score >= 70: {n_high:,} ({n_high/n_hours*100:.2f}%)")
     
     # Save risk analysis
     risk_monthly = df_risk.groupby('year_month')['slippery_level'].value_counts(normalize=True).unstack(fill_value=0) * 100
-    risk_monthly.to_csv('road_risk_monthly.csv')
+    # slippery_level is categorical (low, medium, high): keep the levels that occur,
+    # in the alphabetical column order of the tracked road_risk_monthly.csv
+    risk_monthly = risk_monthly[sorted(risk_monthly.columns[risk_monthly.any()])]
+    save_output(risk_monthly, 'road_risk_monthly.csv', pickle_copy)
     print("Saved: road_risk_monthly.csv")
     
     return df_risk
 
-def analyze_drying_times(pair_df, events_df):
+SEASONS = ['Autumn', 'Spring', 'Summer', 'Winter']
+SEASON_BY_MONTH = np.array([
+    '',
+    'Winter', 'Winter', 'Spring', 'Spring', 'Spring', 'Summer',
+    'Summer', 'Summer', 'Autumn', 'Autumn', 'Autumn', 'Winter',
+])
+
+def analyze_drying_times(pair_df, events_df, pickle_copy=False):
     """Analyze drying times by season and precipitation type."""
     print("\n=== DRYING TIME ANALYSIS ===")
     
@@ -175,13 +221,12 @@ def analyze_drying_times(pair_df, events_df):
     
     # Merge with event details
     analysis_df = events_df.merge(drying_df, on='event_id', how='left')
-    analysis_df['start_ts'] = pd.to_datetime(analysis_df['start_ts'])
-    analysis_df['season'] = analysis_df['start_ts'].dt.month.map({
-        12: 'Winter', 1: 'Winter', 2: 'Winter',
-        3: 'Spring', 4: 'Spring', 5: 'Spring',
-        6: 'Summer', 7: 'Summer', 8: 'Summer',
-        9: 'Autumn', 10: 'Autumn', 11: 'Autumn'
-    })
+    analysis_df['start_ts'] = ensure_datetime(analysis_df['start_ts'])
+    analysis_df['ptype_main'] = analysis_df['ptype_main'].astype('category')
+    # Month -> season lookup table (index 0 = missing start, becomes NaN);
+    # categories in alphabetical order so grouped output keeps its order
+    month = analysis_df['start_ts'].dt.month.fillna(0).astype(int).to_numpy()
+    analysis_df['season'] = pd.Categorical(SEASON_BY_MONTH[month], categories=SEASONS)
     
     print(f"\nTotal events: {len(events_df)}")
     print(f"Events with drying time: {len(drying_df)}")
@@ -197,12 +242,12 @@ def analyze_drying_times(pair_df, events_df):
     
     # By season
     print("\n--- Drying Time by Season (median hours from end) ---")
-    season_drying = analysis_df.groupby('season')['drying_hours_from_end'].agg(['median', 'mean', 'count'])
+    season_drying = analysis_df.groupby('season', observed=True)['drying_hours_from_end'].agg(['median', 'mean', 'count'])
     print(season_drying.round(1))
     
     # By precipitation type
     print("\n--- Drying Time by Precipitation Type (median hours from end) ---")
-    ptype_drying = analysis_df.groupby('ptype_main')['drying_hours_from_end'].agg(['median', 'mean', 'count'])
+    ptype_drying = analysis_df.groupby('ptype_main', observed=True)['drying_hours_from_end'].agg(['median', 'mean', 'count'])
     print(ptype_drying.round(1))
     
     # By intensity
@@ -211,12 +256,19 @@ def analyze_drying_times(pair_df, events_df):
     print(intensity_drying.round(1))
     
     # Save detailed analysis
-    analysis_df.to_csv('drying_times_detailed.csv', index=False)
+    save_output(analysis_df, 'drying_times_detailed.csv', pickle_copy, index=False)
     print("\nSaved: drying_times_detailed.csv")
     
     return analysis_df
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--pickle', action='store_true',
+        help='also write each output table as .pkl (keeps periods, categoricals and datetimes)',
+    )
+    args = parser.parse_args(argv)
+
     print("=" * 60)
     print("HISTORICAL DATA ANALYSIS: FLAGS & THRESHOLDS")
     print("=" * 60)
@@ -236,12 +288,14 @@ def main():
     # Add environment flags
     print("\nAdding environment flags...")
     pair_df = add_environment_flags(pair_df, DEFAULT_THRESHOLDS)
+    # Month key shared by the flag-frequency and road-risk breakdowns
+    pair_df['year_month'] = pair_df['timestamp'].dt.to_period('M')
     
     # Analyze flag frequencies
-    monthly_flags = analyze_flag_frequencies(pair_df)
+    monthly_flags = analyze_flag_frequencies(pair_df, args.pickle)
     
     # Analyze road risk flags
-    risk_df = analyze_road_risk_flags(pair_df)
+    risk_df = analyze_road_risk_flags(pair_df, args.pickle)
     
     # Detect events
     print("\nDetecting precipitation events...")
@@ -250,7 +304,7 @@ def main():
     
     # Analyze drying times
     if not events_df.empty:
-        drying_analysis = analyze_drying_times(pair_df, events_df)
+        drying_analysis = analyze_drying_times(pair_df, events_df, args.pickle)
     
     print("\n" + "=" * 60)
     print("ANALYSIS COMPLETE")
@@ -258,6 +312,8 @@ def main():
     print("  - flag_frequencies_monthly.csv")
     print("  - road_risk_monthly.csv")
     print("  - drying_times_detailed.csv")
+    if args.pickle:
+        print("  (plus a .pkl copy of each)")
     print("=" * 60)
 
 if __name__ == "__main__":
@@ -6,12 +6,12 @@ import pandas as pd
 sys.path.append(os.getcwd())
 
 from backend.core.forecast_adapter import build_forecast_windows
-from backend.core.openmeteo_fetcher import fetch_openmeteo_jyvaskyla
+from backend.core.openmeteo_cache import fetch_openmeteo_jyvaskyla_cached
 
 def main():
     # 1) Fetch 2 days of forecast to keep output small
     print("Fetching forecast...")
-    df_forecast = fetch_openmeteo_jyvaskyla(forecast_days=2)
+    df_forecast = fetch_openmeteo_jyvaskyla_cached(forecast_days=2)
 
     # 2) Adapt + add environment flags
     print("Adapting and flagging...")
@@ -7,12 +7,12 @@ from datetime import datetime
 sys.path.append(os.getcwd())
 
 from backend.core.forecast_adapter import build_forecast_events_with_drying
-from backend.core.openmeteo_fetcher import fetch_openmeteo_jyvaskyla
+from backend.core.openmeteo_cache import fetch_openmeteo_jyvaskyla_cached
 
 def main():
     # 1) Fetch 3 days of forecast
     print("Fetching forecast (3 days)...")
-    df_forecast = fetch_openmeteo_jyvaskyla(forecast_days=3)
+    df_forecast = fetch_openmeteo_jyvaskyla_cached(forecast_days=3)
 
     # 2) Build events with drying
     print("Building events and drying times...")
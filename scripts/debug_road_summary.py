@@ -6,11 +6,12 @@ from datetime import datetime
 # Add project root to path
 sys.path.append(os.getcwd())
 
+from backend.core.openmeteo_cache import fetch_openmeteo_jyvaskyla_cached
 from backend.services.road_forecast_service import build_city_road_forecast
 
 def main():
     print("Building city road forecast (3 days)...")
-    summary = build_city_road_forecast(forecast_days=3)
+    summary = build_city_road_forecast(forecast_days=3, fetch=fetch_openmeteo_jyvaskyla_cached)
 
     print("\n=== STATS ===")
     stats = summary["stats"]